@@ -8,7 +8,7 @@ from .config_manager import ConfigManager, CrawlerConfig
 from .excel_exporter import ExcelExporter
 from .http_client import HttpClient
 from .data_parser import DataParser
-from .utils import get_nested_value
+from .utils import get_nested_value, compile_key_path
 from .crawler import CompanyCrawler, DoubleFetchCrawler, BaseCrawler, ParseError
 
 __all__ = [
@@ -22,6 +22,7 @@ __all__ = [
     'BaseCrawler',
     'ParseError',
     'get_nested_value',
+    'compile_key_path',
 ]
 
 __version__ = '2.0.0'
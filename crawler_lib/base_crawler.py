@@ -4,25 +4,26 @@
 包含爬虫的基础功能和共同逻辑
 """
 
+import itertools
+import logging
+import queue
 import threading
-import time
 import os
-import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional, List, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Optional, Callable, Iterator, List, Dict, Any, Tuple
 
 from .config_manager import ConfigManager, CrawlerConfig
 from .data_parser import DataParser
 from .excel_exporter import ExcelExporter
 from .http_client import HttpClient
-from .utils import get_nested_value
+from .utils import get_nested_value, content_fingerprint
 from .exceptions import ParseError
  
 # 检查是否在测试配置模式中运行
 import os
 # 导入统一日志系统
 from unified_logger import (
-    console, log_error, log_info, log_request, 
+    console, log_error, log_info, log_request, is_enabled_for,
     log_page_progress, log_list_progress, log_contacts_saved
 )
 
@@ -51,7 +52,26 @@ class BaseCrawler:
         data_parser: 数据解析器
     """
     
-    def __init__(self, exhibition_code: str, max_workers: int = 4, start_page: int = 1):
+    # 缓冲写入时累计满多少页或多少行数据写一次Excel（任一条件满足即写入）
+    PENDING_FLUSH_PAGES = 10
+    PENDING_FLUSH_ROWS = 500
+    
+    # 流式分页时，最大有数据页之后累计出现多少个空页即判定到达数据边界
+    EMPTY_PAGES_TO_STOP = 2
+    
+    # 流式与顺序分页时，累计多少个页面请求/解析出错（非 ParseError）即停止翻页；出错的页在翻页结束后统一重试一次
+    FAILED_PAGES_TO_STOP = 3
+    
+    # 相邻两页数据行集合的 Jaccard 相似度达到该值时，视为接口在循环返回（行顺序打乱或少量差异）
+    PAGE_SIMILARITY_TO_STOP = 0.9
+    
+    def __init__(
+        self,
+        exhibition_code: str,
+        max_workers: int = 4,
+        start_page: int = 1,
+        http_client: Optional[HttpClient] = None
+    ):
         """
         初始化爬虫基类
         
@@ -59,6 +79,7 @@ class BaseCrawler:
             exhibition_code: 展会代码
             max_workers: 最大线程数，默认为4
             start_page: 起始页码，默认为1
+            http_client: 共享的HTTP客户端（可选），不传时自行创建；共享的客户端由创建方负责关闭
         
         Raises:
             ValueError: 当展会配置不存在时抛出
@@ -74,24 +95,74 @@ class BaseCrawler:
         if self.config is None:
             raise ValueError(f"未找到展会 '{exhibition_code}' 的配置")
         
+        # 列表页URL不含分页占位符，整个爬取过程不变，只转换一次
+        self._list_url = str(self.config.url)
+        # Excel表头（字段映射的输出列），整个爬取过程不变，只计算一次
+        self._headers: List[str] = list(self.config.company_info_keys.keys())
+        
         # 初始化组件
         self.exporter = ExcelExporter()
-        self.http_client = HttpClient()
+        # 输出文件路径在整个爬取过程中不变，只计算一次
+        self._output_path = self.exporter.get_file_path(exhibition_code)
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or HttpClient(max_workers=max_workers)
         self.data_parser = DataParser()
         
-        # 统计信息
-        self._total_companies = 0
-        self._total_pages = 0
-        self._stats_lock = threading.Lock()
-        # 用于跨页比较的上一页解析结果（用于判断是否停止翻页）
-        self._prev_page_items: Optional[List[Dict[str, Any]]] = None
+        # 列表页请求在整个爬取过程中只有页码会变化：按配置预先确定参数构建函数、
+        # 请求方法、请求头和解析路径，crawl_page 每页只需传入页码
+        self._build_page_request = HttpClient.compile_request_params(self.config)
+        self._list_method = self.config.request_method
+        self._list_headers = self.config.headers or {}
+        # 优先使用加载配置时预编译的键路径
+        self._items_key = self.config.items_key_path or self.config.items_key
+        self._field_mapping = self.config.company_info_paths or self.config.company_info_keys
+        
+        # 统计信息：每处理完一页追加该页数据条数（list.append 在 CPython 中是原子操作，
+        # 并发 worker 记录统计无需加锁；总页数/总条数在读取时汇总）
+        self._page_counts: List[int] = []
+        # 已检查页的签名 {页码: (整页指纹, 行指纹集合)}，用于相邻页相同/近似相同的判定（判断是否停止翻页）；
+        # 两侧相邻页都已比较过的页不会再被用到，签名置为 None 释放
+        self._page_signatures: Dict[int, Optional[Tuple[int, frozenset]]] = {}
+        self._page_lock = threading.Lock()
+        # 最近一次解析的列表页 (原始响应体指纹, 解析结果)，响应体相同时直接复用
+        self._last_page_parse: Optional[tuple] = None
+        # 待写入Excel的页数据缓冲（每页一个列表），累计到阈值后一次性写入
+        self._pending_rows: List[list] = []
+        self._pending_row_count = 0
+        self._pending_lock = threading.Lock()
+        self._pending_closed = False
+        # 已处理数据行的指纹，用于跨页去重（接口返回重叠页、循环页时跳过重复行）
+        self._seen_rows: set[int] = set()
+        self._seen_lock = threading.Lock()
+        # 因重复而跳过的数据行数（汇总信息中显示）
+        self._duplicate_rows = 0
+        # 每个线程最近一次计算签名的页及其行指纹 (页数据, 行指纹列表, 行指纹集合)，供随后的去重直接复用
+        self._row_fingerprint_cache = threading.local()
+        # 整个爬取过程复用的线程池（首次使用时创建，close() 时关闭）
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 写Excel的单线程（首次写入时创建），抓取线程只负责提交，不等待文件保存
+        self._writer: Optional[ThreadPoolExecutor] = None
+        # 本次爬取中是否有批次写入Excel失败（写线程中失败时置位，最终刷新据此返回结果）
+        self._write_failed = False
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        获取爬虫复用的线程池，避免每批/每次分页都重新创建和销毁工作线程
+        
+        Returns:
+            最大线程数为 max_workers 的线程池
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crawler")
+        return self._executor
 
     def _extract_and_parse(
         self,
         response_data: Any,
-        items_key: str,
-        field_mapping: Optional[Dict[str, str]] = None,
-        request_info: Optional[Dict[str, Any]] = None
+        items_key: str | tuple,
+        field_mapping: Optional[Dict[str, str] | tuple] = None,
+        request_info: Optional[Dict[str, Any]] = None,
+        extract_fn: Optional[Callable[[Any], Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
         """
         通用数据提取和解析方法
@@ -100,9 +171,10 @@ class BaseCrawler:
         
         Args:
             response_data: API响应数据
-            items_key: 数据提取路径（如 "data.list"）
-            field_mapping: 字段映射字典（如 {"Company": "name", "Phone": "phone"}）
+            items_key: 数据提取路径（如 "data.list"），或预编译的键元组
+            field_mapping: 字段映射字典（如 {"Company": "name", "Phone": "phone"}），或预编译的字段路径元组
             request_info: 请求信息（用于日志记录）
+            extract_fn: 根据字段映射生成的专用提取函数（可选，见 utils.compile_field_extractor）
         
         Returns:
             数据列表，数据提取失败会抛出异常并记录日志
@@ -113,7 +185,7 @@ class BaseCrawler:
             
             # 2. 如果有字段映射，进行解析
             if field_mapping:
-                return self.data_parser.parse_items(items, field_mapping)
+                return self.data_parser.parse_items(items, field_mapping, extract_fn)
             
             # 3. 否则返回原始items
             return items
@@ -142,19 +214,19 @@ class BaseCrawler:
     def _make_request(
         self,
         url: str,
-        params_str: str = "",
-        data_str: str = "",
+        request_params: Optional[Dict] = None,
+        request_data: Any = None,
         headers: Optional[Dict] = None,
         method: str = "GET",
         context: str = ""
     ) -> dict | list:
         """
-        通用请求方法(适用于列表页请求)：处理请求参数、发送请求、记录日志
+        通用请求方法(适用于列表页请求)：发送请求、记录日志
         
         Args:
-            url: 请求URL（可包含占位符）
-            params_str: URL参数字符串（可包含占位符）
-            data_str: 请求体字符串（可包含占位符）
+            url: 请求URL
+            request_params: 已解析的URL参数（占位符已替换）
+            request_data: 已准备好的请求体（占位符已替换）
             headers: 请求头
             method: 请求方法（GET/POST）
             context: 上下文描述（用于日志）
@@ -162,19 +234,6 @@ class BaseCrawler:
         Returns:
             响应数据
         """
-       
-        # 1. 解析JSON参数
-        request_params = None
-        if params_str and params_str not in ("nan", "{}", "", "None"):
-            try:
-                request_params = json.loads(params_str)
-            except:
-                pass
-        
-        # 2. 准备请求数据
-        request_data = self.http_client.prepare_request_data(data_str, headers or {})
-        
-        # 3. 发送请求
         response_data = self.http_client.send_request_with_retry(
             url=url,
             method=method,
@@ -199,34 +258,43 @@ class BaseCrawler:
         if self.config is None:
             return []
         
-        # 1. 构建请求参数
-        params_str, data_str = self.http_client.build_request_params(self.config, page)
+        # 1. 构建请求参数（初始化时按配置生成的专用函数，仅替换分页占位符）
+        request_params, request_data = self._build_page_request(page)
 
         # 2. 使用通用请求方法
         response_data = self._make_request(
-            url=str(self.config.url),
-            params_str=params_str,
-            data_str=data_str,
-            headers=self.config.headers,
-            method=self.config.request_method,
+            url=self._list_url,
+            request_params=request_params,
+            request_data=request_data,
+            headers=self._list_headers,
+            method=self._list_method,
             context=f"列表页{page}"
         )
         
+        # 响应体与上一次解析的列表页完全相同（常见于翻页结束后的重复页），
+        # 直接返回上次的解析结果，由分页停止判定识别为重复页
+        body_hash = self.http_client.last_body_hash()
+        last_page_parse = self._last_page_parse
+        if body_hash is not None and last_page_parse is not None and last_page_parse[0] == body_hash:
+            return last_page_parse[1]
+        
         # 3. 使用通用提取和解析方法（传递请求信息用于日志）
         request_info = {
-            'url': str(self.config.url),
-            'method': self.config.request_method,
-            'params': params_str,
-            'data': data_str
+            'url': self._list_url,
+            'method': self._list_method,
+            'params': request_params,
+            'data': request_data
         }
         
         company_list = self._extract_and_parse(
             response_data=response_data,
-            items_key=self.config.items_key,
-            field_mapping=self.config.company_info_keys,
-            request_info=request_info
+            items_key=self._items_key,
+            field_mapping=self._field_mapping,
+            request_info=request_info,
+            extract_fn=self.config._extract_fn
         )
         
+        self._last_page_parse = (body_hash, company_list)
         return company_list
     
     def _delete_old_file_if_needed(self):
@@ -234,7 +302,7 @@ class BaseCrawler:
         如果从第一页开始爬取，删除旧的数据文件
         """
         if self.start_page == 1:
-            old_file_path = self.exporter.get_file_path(self.exhibition_code)
+            old_file_path = self._output_path
             if os.path.exists(old_file_path):
                 try:
                     os.remove(old_file_path)
@@ -246,10 +314,265 @@ class BaseCrawler:
         """
         重置统计信息
         """
-        self._total_companies = 0
-        self._total_pages = 0
-        # 清除上一页解析缓存
-        self._prev_page_items = None
+        self._page_counts = []
+        # 清除已检查页的签名
+        with self._page_lock:
+            self._page_signatures = {}
+        self._last_page_parse = None
+        with self._pending_lock:
+            self._pending_rows = []
+            self._pending_row_count = 0
+            self._pending_closed = False
+            self._write_failed = False
+        with self._seen_lock:
+            self._seen_rows = set()
+            self._duplicate_rows = 0
+    
+    @staticmethod
+    def _row_fingerprint(row: Any) -> int:
+        """
+        计算单行数据的指纹（字段值全部相同的行视为同一条数据）
+        
+        使用64位内容指纹而不是内置 hash：内置 hash 会把 1、1.0、True 视为相同，
+        且整数哈希存在 hash(-1) == hash(-2) 这类碰撞，会把不同的行误判为重复而丢弃。
+        
+        Args:
+            row: 解析后的单行数据（未配置字段映射时可能是原始数据）
+        
+        Returns:
+            64位整数指纹
+        """
+        return content_fingerprint(row)
+    
+    def _page_signature(self, items: list) -> Tuple[int, frozenset]:
+        """
+        计算整页数据的签名，用于相邻页相同/近似相同的判定
+        
+        整页指纹是整页数据的64位内容指纹（见 `content_fingerprint`），行指纹集合供近似重复判定复用；
+        之后的跨页比较只是整数相等和集合运算。
+        行指纹列表和集合会记在当前线程上，同一线程随后对该页调用 `_filter_new_rows` 时不再重新计算和分配。
+        
+        Args:
+            items: 一页解析后的数据列表
+        
+        Returns:
+            (整页指纹, 行指纹集合)
+        """
+        row_fingerprints = [self._row_fingerprint(row) for row in items]
+        rows = frozenset(row_fingerprints)
+        self._row_fingerprint_cache.last = (items, row_fingerprints, rows)
+        return content_fingerprint(items), rows
+    
+    def _check_page_repeat(self, page: int, items: list) -> Optional[str]:
+        """
+        记录本页签名，并与已检查过的相邻页（页码 ±1）比较，判断接口是否已无更多数据
+        
+        - 与相邻页解析结果相同：无更多数据（如超出末页后重复返回最后一页或空页）
+        - 与相邻非空页近似相同（行指纹集合的 Jaccard 相似度达到 `PAGE_SIMILARITY_TO_STOP`，
+          每页只有几十行，直接精确计算）：行顺序被打乱或只有少量差异的循环页
+        
+        按页码而不是完成顺序比较，并发 worker 乱序完成时结果不变；读写签名在 `_page_lock` 内进行。
+        
+        Args:
+            page: 页码
+            items: 本页解析后的数据列表
+        
+        Returns:
+            命中时返回原因描述（如 "与第3页相同"），否则返回None
+        """
+        fingerprint, rows = self._page_signature(items)
+        with self._page_lock:
+            signatures = self._page_signatures
+            signatures[page] = (fingerprint, rows)
+            
+            reason = None
+            for neighbour in (page - 1, page + 1):
+                other = signatures.get(neighbour)
+                if other is None:
+                    continue
+                if other[0] == fingerprint:
+                    reason = f"与第{neighbour}页相同"
+                    break
+                if rows and other[1]:
+                    # 并集大小由交集大小推算，不再额外构建并集
+                    common = len(rows & other[1])
+                    similarity = common / (len(rows) + len(other[1]) - common)
+                    if similarity >= self.PAGE_SIMILARITY_TO_STOP:
+                        reason = f"与第{neighbour}页近似相同"
+                        break
+            
+            # 两侧相邻页都已检查过的页不会再参与比较，释放其签名
+            for p in (page - 1, page, page + 1):
+                if signatures.get(p) is not None and p - 1 in signatures and p + 1 in signatures:
+                    signatures[p] = None
+        return reason
+    
+    def _filter_new_rows(self, rows: list, seen: Optional[set] = None) -> list:
+        """
+        过滤掉之前已处理的页中出现过的数据行（跨页去重）
+        
+        相邻页比较只能发现整页重复，无法发现隔页循环或部分重叠的页，这里按行去重，
+        避免重复写入Excel及重复请求详情。只与之前的页比较：同一页内内容完全相同的多行照常保留，
+        本页过滤完成后才把本页的行指纹计入已出现集合。
+        
+        Args:
+            rows: 本页解析后的数据列表
+            seen: 已出现过的行指纹集合；默认使用列表页数据行的 `_seen_rows` 并把重复数计入 `_duplicate_rows`，
+                传入其它集合（如联系人）时重复数由调用方统计
+        
+        Returns:
+            未出现过的数据行（保持原顺序）
+        """
+        # 分页引擎在停止判定时已为这一页计算过行指纹及其集合（同一线程、同一列表对象）时直接复用
+        cached = getattr(self._row_fingerprint_cache, 'last', None)
+        if cached is not None and cached[0] is rows:
+            _, fingerprints, page_fingerprints = cached
+        else:
+            fingerprints = [self._row_fingerprint(row) for row in rows]
+            page_fingerprints = frozenset(fingerprints)
+        count_duplicates = seen is None
+        with self._seen_lock:
+            if seen is None:
+                seen = self._seen_rows
+            # 常见情况：本页的行都没在之前的页出现过，用集合运算（C 实现）一次完成，不再逐行判断
+            if seen.isdisjoint(page_fingerprints):
+                seen |= page_fingerprints
+                return rows
+            new_rows = [row for row, fingerprint in zip(rows, fingerprints) if fingerprint not in seen]
+            seen |= page_fingerprints
+            if count_duplicates:
+                self._duplicate_rows += len(rows) - len(new_rows)
+        return new_rows
+    
+    def _record_page(self, count: int) -> None:
+        """
+        记录一页已处理的数据条数（线程安全，无锁）
+        
+        Args:
+            count: 本页数据条数
+        """
+        self._page_counts.append(count)
+    
+    @property
+    def _total_pages(self) -> int:
+        """已处理的总页数"""
+        return len(self._page_counts)
+    
+    @property
+    def _total_companies(self) -> int:
+        """已处理的总数据条数"""
+        return sum(self._page_counts)
+    
+    def _submit_write(self, pending: List[list], headers: List[str]) -> Future:
+        """
+        把一批待写入的数据交给写Excel的线程（须在 `_pending_lock` 内调用，保证按缓冲顺序写入）
+        
+        Args:
+            pending: 待写入的页数据列表
+            headers: 表头字段列表
+        
+        Returns:
+            写入任务，结果为是否保存成功；失败时会记录错误并置位 `_write_failed`
+        """
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="excel-writer")
+        return self._writer.submit(self._write_batch, pending, headers)
+    
+    def _write_batch(self, pending: List[list], headers: List[str]) -> bool:
+        """
+        在写Excel的线程中写入一批数据；失败时记录错误并置位 `_write_failed`（在任务完成前置位，
+        等待该任务的调用方一定能看到）
+        
+        Args:
+            pending: 待写入的页数据列表
+            headers: 表头字段列表
+        
+        Returns:
+            是否保存成功
+        """
+        row_count = sum(len(rows) for rows in pending)
+        try:
+            saved = self.exporter.save_to(self._output_path, itertools.chain.from_iterable(pending), headers)
+        except Exception as e:
+            log_error(f"写入{row_count}条数据到Excel失败", e)
+            saved = False
+        else:
+            if not saved:
+                log_error(f"写入{row_count}条数据到Excel失败: {self._output_path}")
+        if not saved:
+            self._write_failed = True
+        return saved
+    
+    def _buffer_rows(self, rows: list, headers: List[str]) -> bool:
+        """
+        缓冲一页待保存的数据，累计满 `PENDING_FLUSH_PAGES` 页或 `PENDING_FLUSH_ROWS` 行后一次性写入Excel
+        
+        最终刷新（`_final_flush`）之后到达的数据（如停止翻页后仍在途的页）会立即写入。
+        写入在单独的写Excel线程中进行，调用方（抓取线程）不等待文件保存完成。
+        
+        Args:
+            rows: 本页数据列表
+            headers: 表头字段列表
+        
+        Returns:
+            是否已缓冲或提交写入；之前提交的批次已有写入失败时返回False
+        """
+        with self._pending_lock:
+            self._pending_rows.append(rows)
+            self._pending_row_count += len(rows)
+            if (not self._pending_closed
+                    and len(self._pending_rows) < self.PENDING_FLUSH_PAGES
+                    and self._pending_row_count < self.PENDING_FLUSH_ROWS):
+                return not self._write_failed
+            pending, self._pending_rows = self._pending_rows, []
+            self._pending_row_count = 0
+            self._submit_write(pending, headers)
+        return not self._write_failed
+    
+    def _final_flush(self, headers: List[str]) -> bool:
+        """
+        写入缓冲中剩余的全部数据，并让之后到达的数据直接写入
+        
+        写Excel的线程按提交顺序写入，等待本次写入完成即表示之前提交的数据也已全部写入。
+        
+        Args:
+            headers: 表头字段列表
+        
+        Returns:
+            本次爬取的全部批次是否都保存成功
+        """
+        with self._pending_lock:
+            self._pending_closed = True
+            pending, self._pending_rows = self._pending_rows, []
+            self._pending_row_count = 0
+            future = self._submit_write(pending, headers)
+        
+        # 写线程按提交顺序执行，本次写入完成时之前的批次也已全部完成，失败标志已是最终结果
+        future.result()
+        return not self._write_failed
+    
+    def close(self):
+        """
+        释放爬虫持有的资源（线程池、写Excel的线程、HTTP连接池、缓存的工作簿）
+        
+        会等待线程池中仍在处理的页面（如停止翻页时在途的请求）完成、已提交的数据写入完成后再返回。
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        # 在途页面可能在最终刷新后才提交写入，须在抓取线程池关闭之后再关闭写线程
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        if self._owns_http_client:
+            self.http_client.close()
+        self.exporter.close()
+    
+    def __enter__(self) -> "BaseCrawler":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
     
     def _print_summary(self):
         """
@@ -258,146 +581,155 @@ class BaseCrawler:
         console("\n" + "="*60)
         console("📊 爬取汇总")
         console("="*60)
+        page_counts = list(self._page_counts)
         console(f"展会代码: {self.exhibition_code}")
-        console(f"总页数: {self._total_pages}")
-        console(f"总数据条数: {self._total_companies}")
+        console(f"总页数: {len(page_counts)}")
+        console(f"总数据条数: {sum(page_counts)}")
+        if self._duplicate_rows:
+            console(f"跳过重复数据: {self._duplicate_rows}条")
         console("="*60 + "\n")
 
-    def _should_stop_pagination(
-        self,
-        sorted_pages: list,
-        batch_results: Dict[int, Any],
-        parse_error_pages: Optional[set] = None
-    ) -> bool:
+    def _fetch_pages(self, start_page: int) -> Iterator[Tuple[int, Optional[list], Optional[Exception]]]:
         """
-        统一的分页停止判定。
-
-        停止条件（任意满足即停止）：
-        1. 当前批次中存在解析错误页（由 `ParseError` 导致，记录在 parse_error_pages 中）
-        2. 某页解析结果与上一页解析结果相同（跨页比较），表示无更多数据
-
-        说明：方法会更新 `self._prev_page_items` 为本批次的最后一条有效解析结果（若存在）。
+        从 start_page 开始逐页请求列表页，依次产出 (页码, 解析结果, 异常)；请求失败的页解析结果为 None
         """
-        # 1) 解析错误优先触发停止
-        if parse_error_pages:
-            return True
-
-        prev = self._prev_page_items
-        last_valid = prev
-
-        for p in sorted_pages:
-            val = batch_results.get(p)
-            # 仅对成功解析出的列表进行比较和更新
-            if isinstance(val, list):
-                # 如果上一次存在解析结果，且与当前页相同，则停止
-                if last_valid is not None and val == last_valid:
-                    return True
-                last_valid = val
-
-        # 更新上一页解析结果为本批次结尾的有效值
-        self._prev_page_items = last_valid
-        return False
+        page = start_page
+        while True:
+            try:
+                yield page, self.crawl_page(page), None
+            except Exception as e:
+                yield page, None, e
+            page += 1
 
-    def paginate_batches(
-        self,
-        start_page: int,
-        process_batch_callback,
-        batch_size: int=5
-    ) -> bool:
+    def _prefetch_pages(self, start_page: int, depth: int) -> Iterator[Tuple[int, Optional[list], Optional[Exception]]]:
         """
-        批量并行分页引擎：负责并行抓取一批页面、统一停止判定，并把批次结果交给回调处理。
-
-        回调签名: process_batch_callback(batch_results: Dict[int, list]) -> bool|None
-            - 如果返回 False 则停止分页；返回 True/None 则继续。
+        与 `_fetch_pages` 产出相同，但列表页由线程池中的后台任务提前请求；
+        调用方处理当前页（如抓取详情）时，下一页的列表请求已在进行中。
+
+        已请求（含进行中）但调用方尚未取走的页最多 depth 页，调用方停止时最多多请求 depth 页。
+        调用方停止迭代（break 或关闭生成器）后，后台任务不再发出新的请求，
+        进行中的请求若处于限流重试等待中会立即取消（见 `HttpClient.cancel_on`），关闭线程池时不会长时间阻塞。
+        连续两页为空时后台任务也自行停止：两个空页的解析结果相同，调用方的停止判定必然命中，
+        无需再多请求列表页。后台任务退出时总会放入结束标记，意外出错时先放入异常，
+        调用方读到异常时重新抛出，读到结束标记时结束迭代，不会一直等待。
         """
-        has_data = False
-        current_batch_start = start_page
+        pages: queue.Queue = queue.Queue()
+        # 后台任务每请求一页占用一个名额，调用方取走一页时归还
+        slots = threading.Semaphore(depth)
+        stopped = threading.Event()
+        done = object()
 
-        # 使用单个线程池复用线程资源，保证总并发为 self.max_workers
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        def producer() -> None:
+            try:
+                empty_streak = 0
+                page = start_page
+                with self.http_client.cancel_on(stopped):
+                    while True:
+                        # 等到调用方取走之前的页才请求下一页；调用方停止后不再发出请求
+                        while not slots.acquire(timeout=0.2):
+                            if stopped.is_set():
+                                return
+                        if stopped.is_set():
+                            return
+                        try:
+                            result = (page, self.crawl_page(page), None)
+                        except Exception as e:
+                            result = (page, None, e)
+                        if stopped.is_set():
+                            return
+                        pages.put(result)
+                        # 普通请求错误由调用方记录并稍后重试，继续预取之后的页；解析失败是停止信号
+                        if isinstance(result[2], ParseError):
+                            return
+                        if result[2] is None:
+                            empty_streak = 0 if result[1] else empty_streak + 1
+                            if empty_streak >= 2:
+                                return
+                        page += 1
+            except BaseException as e:
+                pages.put(e)
+            finally:
+                pages.put(done)
+
+        self._get_executor().submit(producer)
+        try:
             while True:
-                batch_end = current_batch_start + batch_size - 1
-                batch_results: Dict[int, Optional[list]] = {}
-                parse_error_pages: set = set()
-
-                future_to_page = {
-                    executor.submit(self.crawl_page, page): page
-                    for page in range(current_batch_start, batch_end + 1)
-                }
-
-                for future in as_completed(future_to_page):
-                    page = future_to_page[future]
-                    try:
-                        items = future.result()
-                        batch_results[page] = items
-                        if items:
-                            has_data = True
-                    except Exception as e:
-                        log_error(f"处理第{page}页时发生错误", e)
-                        # 区分解析失败（ParseError）与其它异常
-                        if isinstance(e, ParseError):
-                            parse_error_pages.add(page)
-                        # 失败页使用 None 标记
-                        batch_results[page] = None
-
-                sorted_pages = sorted(batch_results.keys())
-
-                # 交给回调处理批次结果
-                try:
-                    cont = process_batch_callback(batch_results)
-                    if cont is False:
-                        break
-                except Exception as e:
-                    log_error("处理批次回调时出错", e)
-                    break
-
-                # 统一停止判定（解析错误或与上一页相同）
-                if self._should_stop_pagination(sorted_pages, batch_results, parse_error_pages):
-                    log_info("分页停止判定命中，停止爬取")
-                    break
-
-                current_batch_start = batch_end + 1
-
-        return has_data
+                result = pages.get()
+                if result is done:
+                    return
+                if isinstance(result, BaseException):
+                    raise result
+                slots.release()
+                yield result
+        finally:
+            stopped.set()
 
-    def paginate_sequential(self, start_page: int,  process_page_callback) -> bool:
+    def paginate_sequential(self, start_page: int,  process_page_callback, prefetch: int = 0) -> bool:
         """
         顺序分页引擎：逐页请求并交给回调处理；内部会检测连续空页与相邻页相同的情况并停止。
 
+        与 `paginate_streaming` 相同，出错的页（非 ParseError）不会中断翻页，而是记录下来，
+        累计 `FAILED_PAGES_TO_STOP` 个时停止；翻页结束后统一重试一次（见 `_retry_failed_pages`）。
+
         回调签名: process_page_callback(page:int, items:list) -> bool|None
-            - 如果返回 False 则停止分页；返回 True/None 则继续。
+            - 如果返回 False 则停止分页（不再重试出错的页）；返回 True/None 则继续。
+
+        Args:
+            prefetch: 大于0时，在回调处理当前页的同时在后台预取后续列表页（最多缓存 prefetch 页），
+                页面仍按页码顺序交给回调；停止时最多多请求几页列表页
         """
-        page = start_page
         has_data = False
+        # 回调要求停止或出错时为True，此时不再重试出错的页
+        aborted = False
+        failed_pages: List[int] = []
+        last_data_page = start_page - 1
+        pages = self._prefetch_pages(start_page, prefetch) if prefetch > 0 else self._fetch_pages(start_page)
 
-        while True:
-            try:
-                items = self.crawl_page(page)
-            except Exception as e:
-                # 如果是解析失败，作为停止信号；其它异常记录后停止
-                if isinstance(e, ParseError):
-                    log_info(f"第{page}页解析失败（ParseError），停止爬取: {e}")
-                else:
-                    log_error(f"抓取第{page}页时发生错误", e)
-                break
-
-            # 使用统一的停止判定（基于上一次解析结果）
-            batch_results = {page: items}
-            if self._should_stop_pagination([page], batch_results):
-                log_info(f"第{page}页数据与上一页相同或无更多数据，停止爬取")
-                break
+        try:
+            for page, items, error in pages:
+                if error is not None:
+                    # 如果是解析失败，作为停止信号；其它异常记录下来，翻页结束后重试
+                    if isinstance(error, ParseError):
+                        log_info(f"第{page}页解析失败（ParseError），停止爬取: {error}")
+                        break
+                    log_error(f"抓取第{page}页时发生错误，稍后重试", error)
+                    failed_pages.append(page)
+                    if len(failed_pages) >= self.FAILED_PAGES_TO_STOP:
+                        break
+                    continue
 
-            has_data = True
+                # 与上一页相同或近似相同时停止
+                reason = self._check_page_repeat(page, items)
+                if reason:
+                    log_info(f"第{page}页数据{reason}，无更多数据，停止爬取")
+                    break
 
-            try:
-                cont = process_page_callback(page, items)
-                if cont is False:
+                has_data = True
+                if items:
+                    last_data_page = page
+
+                try:
+                    cont = process_page_callback(page, items)
+                    if cont is False:
+                        aborted = True
+                        break
+                except Exception as e:
+                    log_error(f"处理第{page}页回调时出错", e)
+                    aborted = True
                     break
-            except Exception as e:
-                log_error(f"处理第{page}页回调时出错", e)
-                break
+        finally:
+            # 关闭生成器，使预取任务停止
+            pages.close()
 
-            page += 1
+        if failed_pages and not aborted:
+            def should_stop(page: int, items: list) -> bool:
+                reason = self._check_page_repeat(page, items)
+                if reason:
+                    log_info(f"第{page}页数据{reason}，无更多数据，停止重试")
+                return bool(reason)
+
+            if self._retry_failed_pages(failed_pages, process_page_callback, should_stop, last_data_page):
+                has_data = True
 
         return has_data
 
@@ -407,104 +739,203 @@ class BaseCrawler:
 
         停止判定：
         - 如果某页抛出 `ParseError`，立即停止；
-        - 如果某页解析结果与上一页解析结果相同，立即停止；
+        - 如果某页解析结果与相邻页相同或近似相同，立即停止；
+        - 如果在已完成的最大有数据页之后出现 `EMPTY_PAGES_TO_STOP` 个空页（与完成顺序无关），立即停止；
+        - 如果累计 `FAILED_PAGES_TO_STOP` 个页面出错（非 ParseError），停止；
         - 如果回调返回 False，则停止。
 
+        出错的页不会中断翻页，而是记录下来（按页码去重），翻页结束后统一重试一次；
+        已判定的数据末尾之后的出错页不再重试，重试成功的页同样经过上述相同页/近似重复页/数据边界判定。
+        回调返回 False 或出错时不再重试。
+
         回调签名: process_page_callback(page:int, items:list) -> bool|None
+
+        说明：worker 运行在爬虫复用的线程池中，`max_workers` 不能超过 self.max_workers。
         """
-        max_workers = max_workers or self.max_workers
-        next_page = start_page
+        max_workers = min(max_workers or self.max_workers, self.max_workers)
+        # itertools.count 的 next() 在 CPython 中是原子操作，各 worker 取页号无需加锁
+        page_counter = itertools.count(start_page)
         has_data = False
         stop = False
-        counter_lock = threading.Lock()
+        # 回调要求停止或出错时为True，此时不再重试出错的页
+        aborted = False
+        # 数据边界检测：已完成的最大有数据页，以及其后已完成的空页
+        highest_data_page = start_page - 1
+        empty_tail: set = set()
+        # 停止判定命中时确定的最后一页（之后的页已超出数据范围），未命中时为None
+        data_end_page: Optional[int] = None
+        tail_lock = threading.Lock()
+        # 出错待重试的页（dict 作为有序集合：保持出错顺序且不重复），与数据边界共用 tail_lock
+        failed_pages: Dict[int, None] = {}
+
+        def mark_data_end(page: int) -> None:
+            nonlocal data_end_page
+            with tail_lock:
+                if data_end_page is None or page < data_end_page:
+                    data_end_page = page
+
+        def reached_data_end(page: int, items: list) -> bool:
+            nonlocal highest_data_page, empty_tail
+            with tail_lock:
+                if items:
+                    if page > highest_data_page:
+                        highest_data_page = page
+                        # 有数据页之前的空页只是中途空页，不计入尾部（尾部通常为空，无需重建集合）
+                        if empty_tail:
+                            empty_tail = {p for p in empty_tail if p > page}
+                    return False
+                if page > highest_data_page:
+                    empty_tail.add(page)
+                return len(empty_tail) >= self.EMPTY_PAGES_TO_STOP
+
+        def should_stop(page: int, items: list) -> bool:
+            """本页命中停止条件（与相邻页相同/近似相同、到达数据末尾）时记录原因并返回True"""
+            # 检测与相邻页相同或近似相同（无更多数据，或接口在循环返回）
+            reason = self._check_page_repeat(page, items)
+            if reason:
+                if is_enabled_for(logging.INFO):
+                    log_info(f"第{page}页数据{reason}，停止爬取")
+                mark_data_end(page)
+                return True
+
+            # 检测数据边界：最大有数据页之后已连续出现多个空页
+            if reached_data_end(page, items):
+                if is_enabled_for(logging.INFO):
+                    log_info(f"第{page}页为空，已到达数据末尾，停止爬取")
+                mark_data_end(highest_data_page)
+                return True
+            return False
 
         def worker_loop() -> None:
-            nonlocal next_page, has_data, stop
-            while True:
+            nonlocal has_data, stop, aborted
+            while not stop:
                 # 获取下一个页号
-                with counter_lock:
-                    if stop:
-                        return
-                    page = next_page
-                    next_page += 1
+                page = next(page_counter)
 
                 try:
                     items = self.crawl_page(page)
-                except Exception as e:
-                    if isinstance(e, ParseError):
+                except ParseError as e:
+                    if is_enabled_for(logging.INFO):
                         log_info(f"第{page}页解析失败（ParseError），停止爬取: {e}")
-                    else:
-                        log_error(f"处理第{page}页时发生错误", e)
                     stop = True
                     return
+                except Exception as e:
+                    log_error(f"处理第{page}页时发生错误，稍后重试", e)
+                    with tail_lock:
+                        failed_pages[page] = None
+                        too_many_failures = len(failed_pages) >= self.FAILED_PAGES_TO_STOP
+                    if too_many_failures:
+                        stop = True
+                        return
+                    continue
 
-                # 检测与上一页相同（无更多数据）
-                prev = self._prev_page_items
-                if isinstance(items, list) and prev is not None and items == prev:
-                    log_info(f"第{page}页数据与上一页相同，停止爬取")
-                    # 更新 prev for consistency
-                    self._prev_page_items = items
+                if isinstance(items, list) and should_stop(page, items):
                     stop = True
                     return
 
-                # 更新 prev
-                if isinstance(items, list):
-                    self._prev_page_items = items
-
                 # 立即处理并保存这一页
                 try:
                     cont = process_page_callback(page, items)
                     if cont is False:
-                        stop = True
+                        aborted = stop = True
                         return
                 except Exception as e:
                     log_error(f"处理第{page}页回调时出错", e)
-                    stop = True
+                    aborted = stop = True
                     return
 
                 if items:
                     has_data = True
 
-        # 启动 worker 数量等于并发限制的长期运行任务
-        executor = ThreadPoolExecutor(max_workers=max_workers)
+        def run_worker() -> None:
+            nonlocal stop
+            try:
+                worker_loop()
+            except Exception as e:
+                log_error("分页worker执行时发生错误", e)
+                stop = True
+
+        # 在复用的线程池中启动 worker 数量等于并发限制的长期运行任务：
+        # 每个 worker 处理完一页就取下一个页号（滑动窗口），始终保持 max_workers 个页在途，没有批次屏障
+        executor = self._get_executor()
+        workers = [executor.submit(run_worker) for _ in range(max_workers)]
+
+        # 等待所有 worker 退出：停止判定命中后，各 worker 处理完手头的页即退出，
+        # 保证返回前在途页都已交给回调处理（不设总时长上限，长时间的爬取不会被中途截断）
+        wait(workers)
+
+        # 已判定的数据末尾之后的出错页（如末页之后返回404/500的页）无需重试
+        retry_pages = [p for p in failed_pages if data_end_page is None or p <= data_end_page]
+        if retry_pages and not aborted and self._retry_failed_pages(
+                retry_pages, process_page_callback, should_stop, highest_data_page):
+            has_data = True
+
+        return has_data
+
+    def _retry_failed_pages(
+        self,
+        pages: List[int],
+        process_page_callback,
+        should_stop: Callable[[int, list], bool],
+        last_data_page: int
+    ) -> bool:
+        """
+        翻页结束后并行重试出错的页（每页只重试一次），成功的页按页码顺序经过停止判定后交给回调处理
+
+        某页解析失败（ParseError）、再次出错、命中停止判定或回调返回 False 时，不再处理之后的页。
+        再次出错的页在最后一个有数据的页之前时，把未成功的页记录到错误日志，提示本次爬取的数据不完整；
+        在其之后时（如末页之后返回404/500的页）视为已超出数据末尾，只记录提示信息。
+
+        Args:
+            pages: 出错的页码（已去重）
+            process_page_callback: 与分页引擎相同的页处理回调
+            should_stop: 与分页引擎相同的停止判定，命中时返回True
+            last_data_page: 翻页过程中最后一个有数据的页码
+
+        Returns:
+            是否有重试成功且有数据的页
+        """
+        pages = sorted(pages)
+        log_info(f"重试出错的页: {pages}")
+        executor = self._get_executor()
+        futures = [executor.submit(self.crawl_page, page) for page in pages]
+
+        has_data = False
+        unrecovered: List[int] = []
         try:
-            workers = [executor.submit(worker_loop) for _ in range(max_workers)]
-            
-            # 等待所有 worker 退出，使用超时机制避免无限阻塞
-            import time
-            start_time = time.time()
-            max_wait_time = 300  # 最大等待5分钟，防止无限阻塞
-            
-            for i, f in enumerate(as_completed(workers, timeout=max_wait_time)):
-                # 检查是否已经停止
-                with counter_lock:
-                    if stop:
-                        # 如果已经停止，尝试取消剩余的任务
-                        for j in range(i + 1, len(workers)):
-                            workers[j].cancel()
+            for index, (page, future) in enumerate(zip(pages, futures)):
+                try:
+                    items = future.result()
+                except ParseError as e:
+                    log_info(f"重试第{page}页解析失败（ParseError），停止重试: {e}")
+                    break
+                except Exception as e:
+                    # 再次出错时不再等待之后的页（页码递增，之后的页多半同样超出末页或仍不可用）
+                    if page > last_data_page:
+                        log_info(f"重试第{page}页仍然失败，该页在最后一个有数据的页（第{last_data_page}页）之后，"
+                                 f"视为已超出数据末尾，停止重试: {e}")
+                    else:
+                        log_error(f"重试第{page}页仍然失败，停止重试", e)
+                        unrecovered = pages[index:]
+                    break
+                if should_stop(page, items):
+                    break
+                if not items:
+                    continue
+                try:
+                    cont = process_page_callback(page, items)
+                    has_data = True
+                    if cont is False:
                         break
-                
-                # 检查超时
-                if time.time() - start_time > max_wait_time:
-                    log_info("分页处理超时，强制停止")
-                    with counter_lock:
-                        stop = True
-                    # 取消所有未完成的任务
-                    for j in range(i + 1, len(workers)):
-                        workers[j].cancel()
+                except Exception as e:
+                    log_error(f"处理第{page}页回调时出错", e)
                     break
-                    
-        except Exception as e:
-            log_error("线程池执行时发生错误", e)
-            with counter_lock:
-                stop = True
         finally:
-            # 确保线程池被正确关闭
-            try:
-                executor.shutdown(wait=False)  # 不等待，避免阻塞
-            except Exception:
-                pass
-
+            # 停止后不再需要尚未开始的重试请求
+            for future in futures:
+                future.cancel()
+        if unrecovered:
+            log_error(f"以下页重试后仍未获取成功，本次爬取的数据可能不完整: {unrecovered}")
         return has_data
 
     def crawl(self) -> bool:
@@ -4,10 +4,11 @@
 适用于API一次性返回完整数据的场景
 """
 
+import logging
 from typing import Dict, List
 
 from .base_crawler import BaseCrawler
-from unified_logger import log_error
+from unified_logger import log_error, log_info, log_page_progress, is_enabled_for
 
 
 class CompanyCrawler(BaseCrawler):
@@ -35,20 +36,20 @@ class CompanyCrawler(BaseCrawler):
         if self.config is None:
             return False
 
-        headers = list(self.config.company_info_keys.keys())
+        headers = self._headers
 
         def _process_page(page: int, items: list):
-            company_list = items or []
+            # 跳过之前页已出现过的数据行（重叠页/循环页）
+            company_list = self._filter_new_rows(items) if items else []
             if company_list:
-                try:
-                    self.exporter.save(company_list, self.exhibition_code, headers)
-                    with self._stats_lock:
-                        self._total_companies += len(company_list)
-                        self._total_pages += 1
-                    from unified_logger import log_page_progress
-                    log_page_progress(page, len(company_list))
-                except Exception as e:
-                    log_error(f"保存第{page}页数据出错", e)
+                # 先缓冲，每累计若干页再统一写入Excel，减少文件读写和锁竞争
+                if not self._buffer_rows(company_list, headers):
+                    log_error(f"之前的数据写入Excel失败，停止爬取（第{page}页）")
+                    return False
+                self._record_page(len(company_list))
+                log_page_progress(page, len(company_list))
+            elif items and is_enabled_for(logging.INFO):
+                log_info(f"第{page}页的{len(items)}条数据均已出现过，跳过保存")
 
             return True
 
@@ -74,7 +75,15 @@ class CompanyCrawler(BaseCrawler):
             self._reset_stats()
             
             # 执行爬取
-            has_data = self.crawl_parallel()
+            try:
+                has_data = self.crawl_parallel()
+            finally:
+                # 无论是否获取到数据，都写入缓冲中剩余的数据
+                saved = self._final_flush(self._headers)
+            
+            if not saved:
+                log_error(f"部分数据未能写入Excel，请检查输出文件: {self._output_path}")
+                return False
             
             # 显示汇总信息
             if has_data:
@@ -83,6 +92,8 @@ class CompanyCrawler(BaseCrawler):
             return has_data
             
         except Exception as e:
-            from unified_logger import log_error
             log_error("爬取过程中发生错误", e)
             return False
+        
+        finally:
+            self.close()
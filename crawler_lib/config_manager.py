@@ -4,14 +4,47 @@
 负责从JSON配置文件中加载和管理爬虫配置
 """
 
-import json
 import os
 import glob
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
 
 from unified_logger import log_info, log_warning, log_exception
 
+from .utils import json_loads, compile_key_path, compile_field_paths, compile_field_extractor
+
+
+def _compile_items_key(items_key: Optional[str]) -> tuple:
+    """预编译数据提取路径；表格导出遗留的 "nan"/"None" 与空路径一样视为不提取"""
+    if not items_key or str(items_key) in ("nan", "None"):
+        return ()
+    return compile_key_path(str(items_key))
+
+
+@lru_cache(maxsize=512)
+def _frozen_headers(items: tuple) -> Mapping[str, Any]:
+    """按内容缓存冻结后的请求头；键值对（含顺序）相同的配置共享同一个只读映射"""
+    return MappingProxyType(dict(items))
+
+
+def _shared_headers(headers: Optional[dict]) -> Mapping[str, Any]:
+    """
+    获取请求头的共享只读视图，所有请求直接共享，无需逐请求复制
+    
+    很多展会（如同一小程序）的请求头完全相同，按键值对元组复用同一个只读映射，避免每个配置各存一份；
+    请求头是一层键值，无需经过JSON序列化。
+    """
+    items = tuple((headers or {}).items())
+    try:
+        return _frozen_headers(items)
+    except TypeError:
+        # 值中含有列表/字典等不可哈希的值时不共享
+        return MappingProxyType(dict(items))
+
 
 @dataclass
 class CrawlerConfig:
@@ -23,7 +56,7 @@ class CrawlerConfig:
     # 基本配置
     url: str
     request_method: str
-    headers: dict
+    headers: Mapping[str, Any]    # 只读视图，所有请求共享，不做逐请求复制
     params: dict    # 修改为字典类型
     data: dict     # 修改为字典类型
     items_key: str
@@ -35,11 +68,21 @@ class CrawlerConfig:
     # 二次请求配置（仅在 double 模式下使用）
     url_detail: Optional[str] = None
     request_method_detail: Optional[str] = None
-    headers_detail: Optional[dict] = None
+    headers_detail: Optional[Mapping[str, Any]] = None
     params_detail: Optional[dict] = None  # 修改为字典类型
     data_detail: Optional[dict] = None   # 修改为字典类型
     items_key_detail: Optional[str] = None
     info_key: Optional[dict] = None
+    
+    # 加载时预编译的键路径（原始的点号路径字符串仍保留在上面的字段中，便于调试和编辑）
+    items_key_path: tuple = ()
+    company_info_paths: tuple = ()
+    items_key_detail_path: tuple = ()
+    info_paths: tuple = ()
+    
+    # 根据字段路径生成的专用提取函数（见 utils.compile_field_extractor），为None时使用通用解析
+    _extract_fn: Optional[Callable] = field(default=None, init=False, repr=False, compare=False)
+    _detail_extract_fn: Optional[Callable] = field(default=None, init=False, repr=False, compare=False)
 
 
 class ConfigManager:
@@ -47,23 +90,30 @@ class ConfigManager:
     配置管理器类
     
     负责从JSON配置文件中加载并管理各展会的爬虫配置。
-    使用单例模式确保配置只加载一次。
+    使用单例模式确保配置只加载一次（多线程同时实例化时也只加载一次）。
     """
     
     _instance: Optional['ConfigManager'] = None
     _configs: dict[str, CrawlerConfig] = {}
     _initialized: bool = False
     _config_dir: str = 'config'
+    _lock = threading.Lock()
     
     def __new__(cls) -> 'ConfigManager':
+        # 双重检查加锁，避免并发创建多个实例
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
     
     def __init__(self):
+        # 双重检查加锁，保证并发实例化时配置只加载一次，且其它线程等待加载完成
         if not ConfigManager._initialized:
-            self._load_configurations()
-            ConfigManager._initialized = True
+            with ConfigManager._lock:
+                if not ConfigManager._initialized:
+                    self._load_configurations()
+                    ConfigManager._initialized = True
     
     def _load_configurations(self) -> None:
         """从JSON文件加载配置"""
@@ -77,54 +127,84 @@ class ConfigManager:
             log_warning(f"配置目录 {self._config_dir} 中没有找到JSON配置文件")
             return
         
+        # 配置文件的读取和解析是I/O密集型操作，使用线程池并行加载；
+        # 结果按文件顺序在主线程中合并，避免并发修改 self._configs
+        with ThreadPoolExecutor(max_workers=min(16, len(json_files))) as executor:
+            results = list(executor.map(self._load_one, json_files))
+        
         config_count = 0
-        for json_file in json_files:
-            try:
-                # 跳过索引文件
-                if os.path.basename(json_file) == 'index.json':
-                    continue
-                
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-                
-                exhibition_code = config_data.get('exhibition_code')
-                if not exhibition_code:
-                    log_warning(f"配置文件 {json_file} 缺少 exhibition_code 字段，跳过")
-                    continue
-                
-                # 基本配置
-                config = CrawlerConfig(
-                    exhibition_code=exhibition_code,
-                    miniprogram_name=config_data.get('miniprogram_name', ''),
-                    url=config_data.get('url', ''),
-                    request_method=config_data.get('request_method', 'POST'),
-                    headers=config_data.get('headers', {}),
-                    params=config_data.get('params', {}),    # 修改为字典类型
-                    data=config_data.get('data', {}),        # 修改为字典类型
-                    items_key=config_data.get('items_key', ''),
-                    company_info_keys=config_data.get('company_info_keys', {}),
-                    request_mode=config_data.get('request_mode', 'single')
-                )
-                
-                # 二次请求配置
-                if config.request_mode == "double":
-                    config.url_detail = config_data.get('url_detail')
-                    config.request_method_detail = config_data.get('request_method_detail', 'GET')
-                    config.headers_detail = config_data.get('headers_detail', {})
-                    config.params_detail = config_data.get('params_detail', {})  # 修改为字典类型
-                    config.data_detail = config_data.get('data_detail', {})      # 修改为字典类型
-                    config.items_key_detail = config_data.get('items_key_detail', '')
-                    config.info_key = config_data.get('info_key', {})
-                
-                self._configs[exhibition_code] = config
-                config_count += 1
-                
-            except Exception as e:
-                log_exception(f"加载配置文件失败 {json_file}: {e}")
+        for result in results:
+            if result is None:
                 continue
+            exhibition_code, config = result
+            self._configs[exhibition_code] = config
+            config_count += 1
         
         log_info(f"成功加载 {config_count} 个配置文件",ui=False)
     
+    def _load_one(self, json_file: str) -> Optional[tuple[str, CrawlerConfig]]:
+        """
+        加载单个JSON配置文件
+        
+        Args:
+            json_file: 配置文件路径
+        
+        Returns:
+            (展会代码, 配置对象)，文件被跳过或加载失败时返回None
+        """
+        try:
+            # 跳过索引文件
+            if os.path.basename(json_file) == 'index.json':
+                return None
+            
+            with open(json_file, 'rb') as f:
+                config_data = json_loads(f.read())
+            
+            exhibition_code = config_data.get('exhibition_code')
+            if not exhibition_code:
+                log_warning(f"配置文件 {json_file} 缺少 exhibition_code 字段，跳过")
+                return None
+            
+            # 基本配置
+            config = CrawlerConfig(
+                exhibition_code=exhibition_code,
+                miniprogram_name=config_data.get('miniprogram_name', ''),
+                url=config_data.get('url', ''),
+                request_method=config_data.get('request_method', 'POST'),
+                headers=_shared_headers(config_data.get('headers')),
+                params=config_data.get('params', {}),    # 修改为字典类型
+                data=config_data.get('data', {}),        # 修改为字典类型
+                items_key=config_data.get('items_key', ''),
+                company_info_keys=config_data.get('company_info_keys', {}),
+                request_mode=config_data.get('request_mode', 'single')
+            )
+            
+            # 二次请求配置
+            if config.request_mode == "double":
+                config.url_detail = config_data.get('url_detail')
+                config.request_method_detail = config_data.get('request_method_detail', 'GET')
+                config.headers_detail = _shared_headers(config_data.get('headers_detail'))
+                config.params_detail = config_data.get('params_detail', {})  # 修改为字典类型
+                config.data_detail = config_data.get('data_detail', {})      # 修改为字典类型
+                config.items_key_detail = config_data.get('items_key_detail', '')
+                config.info_key = config_data.get('info_key', {})
+                config.items_key_detail_path = _compile_items_key(config.items_key_detail)
+                config.info_paths = compile_field_paths(config.info_key)
+                if config.info_paths:
+                    config._detail_extract_fn = compile_field_extractor(config.info_paths)
+            
+            # 预编译键路径，避免每页每条数据重复拆分路径字符串
+            config.items_key_path = _compile_items_key(config.items_key)
+            config.company_info_paths = compile_field_paths(config.company_info_keys)
+            if config.company_info_paths:
+                config._extract_fn = compile_field_extractor(config.company_info_paths)
+            
+            return exhibition_code, config
+            
+        except Exception as e:
+            log_exception(f"加载配置文件失败 {json_file}: {e}")
+            return None
+    
     def get_config(self, exhibition_code: str) -> Optional[CrawlerConfig]:
         """
         获取指定展会的配置
@@ -148,19 +228,6 @@ class ConfigManager:
     
     def reload_configs(self) -> None:
         """重新加载所有配置"""
-        self._configs.clear()
-        self._load_configurations()
-    
-    def _safe_json_load(self, json_data: Any) -> dict:
-        """安全地加载JSON数据"""
-        try:
-            if json_data is None or json_data == '':
-                return {}
-            if isinstance(json_data, dict):
-                return json_data
-            elif isinstance(json_data, str):
-                return json.loads(json_data)
-            else:
-                return {}
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        with ConfigManager._lock:
+            self._configs.clear()
+            self._load_configurations()
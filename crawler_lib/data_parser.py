@@ -4,7 +4,7 @@
 负责从API响应中提取和解析公司信息
 """
 
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from .utils import get_nested_value
 
@@ -14,10 +14,13 @@ class DataParser:
     数据解析器
     
     负责从API响应中提取公司信息及联系人信息。
+    只有静态方法、不保存状态，因此不为实例分配属性字典。
     """
-    
+
+    __slots__ = ()
+
     @staticmethod
-    def extract_items(response_data: Dict[str, Any], items_key: str) -> List[Dict[str, Any]]:
+    def extract_items(response_data: Dict[str, Any], items_key: str | Tuple[str, ...]) -> List[Dict[str, Any]]:
         """
         从API响应数据中提取指定路径的列表数据。
         
@@ -28,7 +31,7 @@ class DataParser:
         如果提取到的数据是字典，会强制转化成单字典列表
         Args:
             response_data: API响应数据（可以是字典或列表）
-            items_key: 数据提取路径（如 "data.list"）
+            items_key: 数据提取路径（如 "data.list"），或预编译的键元组（如 ("data", "list")）
         
         Returns:
             提取的列表数据，提取失败会抛出异常
@@ -42,7 +45,10 @@ class DataParser:
         
         items = response_data
         # 根据items_key提取嵌套数据
-        if items_key and str(items_key) not in ("nan", "", "None"):
+        if isinstance(items_key, tuple):
+            if items_key:
+                items = get_nested_value(response_data, items_key)
+        elif items_key and str(items_key) not in ("nan", "", "None"):
             items = get_nested_value(response_data, items_key)
                     
         if isinstance(items, dict):
@@ -51,26 +57,44 @@ class DataParser:
         return items if isinstance(items, list) else []
     
     @staticmethod
-    def parse_items(items: list, field_mappings: dict) -> list[dict]:
+    def parse_items(
+        items: list,
+        field_mappings: dict | Iterable[Tuple[str, Tuple[str, ...]]],
+        extract_fn: Optional[Callable[[Any], Dict[str, Any]]] = None
+    ) -> list[dict]:
         """
         从响应体的信息主体数据列表中，根据字段映射提取需要的字段信息
         
         Args:
             items: 响应体的信息主体数据列表
-            field_mappings: 字段映射配置 {输出字段名: 源数据路径}
+            field_mappings: 字段映射配置 {输出字段名: 源数据路径}，
+                或预编译的 ((输出字段名, 键元组), ...)（见 `compile_field_paths`）
+            extract_fn: 根据同一字段映射生成的专用提取函数（可选，见 `compile_field_extractor`），
+                提供时优先使用，出错的数据再交给通用路径处理
         
         Returns:
             解析后的数据信息列表，提取失败会抛出异常
         """
         results = []
+        field_paths = field_mappings.items() if isinstance(field_mappings, dict) else field_mappings
         
         for item in items:
+            if extract_fn is not None:
+                try:
+                    results.append(extract_fn(item))
+                    continue
+                except Exception:
+                    # 交给下面的通用路径，生成一致的错误信息
+                    pass
+            
             company_info = {}
             
-            for output_field, source_path in field_mappings.items():
+            for output_field, source_path in field_paths:
                 try:
                     company_info[output_field] = get_nested_value(item, source_path)
                 except Exception:
+                    if not isinstance(source_path, str):
+                        source_path = '.'.join(source_path)
                     raise ValueError(f"字段提取失败: {output_field} from path {source_path}\n{item}")
             results.append(company_info)
         
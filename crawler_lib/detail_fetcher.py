@@ -5,19 +5,21 @@
 使用统一的无限重试机制，保证数据抓取成功
 """
 
-import json
-from typing import Any, Dict, List, Optional, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
+from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import as_completed
 
 
 from .config_manager import CrawlerConfig
 from .http_client import HttpClient
 from .data_parser import DataParser
-from .utils import replace_placeholders
+from .utils import json_loads, replace_placeholders
 
 from .base_crawler import BaseCrawler
 
+# 视为"未配置"的详情请求模板字符串
+_EMPTY_TEMPLATES = frozenset(("nan", "{}", ""))
+
 class DetailFetcher(BaseCrawler):
     """
     详情获取器
@@ -27,19 +29,43 @@ class DetailFetcher(BaseCrawler):
     使用统一的无限重试机制，保证请求成功。
     """
     
-    def __init__(self, config: CrawlerConfig, max_workers: int = 4):
+    def __init__(self, config: CrawlerConfig, max_workers: int = 4, http_client: Optional[HttpClient] = None):
         """
         初始化详情获取器
         
         Args:
             config: 爬虫配置
             max_workers: 最大并发线程数
+            http_client: 共享的HTTP客户端（可选），传入时与列表页请求共用同一个会话和连接池
         """
-        # 统计信息
+        # 统计信息（多个线程可能同时批量获取，累加时加锁）
         self._success_count = 0
+        self._success_lock = threading.Lock()
 
-        super().__init__(config.exhibition_code, max_workers)
+        super().__init__(config.exhibition_code, max_workers, http_client=http_client)
         
+        # 详情请求模板在爬取期间不变，预先找出 params/data 字典中含占位符的键，
+        # 每次请求只替换这些键，不再遍历整个字典逐个判断
+        self._params_detail_placeholder_keys = self._placeholder_keys(config.params_detail)
+        self._data_detail_placeholder_keys = self._placeholder_keys(config.data_detail)
+    
+    @staticmethod
+    def _placeholder_keys(template: Any) -> tuple:
+        """找出字典模板中值含有占位符 #key 的键（非字典模板返回空元组）"""
+        if not isinstance(template, dict):
+            return ()
+        return tuple(
+            key for key, value in template.items()
+            if isinstance(value, str) and '#' in value
+        )
+    
+    @staticmethod
+    def _fill_placeholders(template: dict, keys: tuple, company: Dict[str, Any]) -> dict:
+        """复制字典模板，并用公司数据替换预先找出的占位符键"""
+        result = template.copy()
+        for key in keys:
+            result[key] = replace_placeholders(template[key], company)
+        return result
 
     def fetch_company_contacts(self, company: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -74,64 +100,40 @@ class DetailFetcher(BaseCrawler):
         params = None
         if self.config.params_detail:
             if isinstance(self.config.params_detail, dict):
-                # 检查整个字典是否包含占位符
-                dict_has_placeholder = any(
-                    isinstance(value, str) and '#' in value 
-                    for value in self.config.params_detail.values()
+                # 只替换初始化时找出的占位符键，不含占位符时即为直接复制
+                params = self._fill_placeholders(
+                    self.config.params_detail, self._params_detail_placeholder_keys, company
                 )
-                
-                if dict_has_placeholder:
-                    # 只有包含占位符时才遍历和替换
-                    params = {}
-                    for key, value in self.config.params_detail.items():
-                        if isinstance(value, str) and '#' in value:
-                            params[key] = replace_placeholders(value, company)
-                        else:
-                            params[key] = value
-                else:
-                    # 不包含占位符，直接复制
-                    params = self.config.params_detail.copy()
             else:
                 # 如果是字符串，先检查是否包含占位符，再决定是否替换
                 try:
                     params_str = str(self.config.params_detail)
                     if '#' in params_str:
                         params_str = replace_placeholders(params_str, company)
-                    if params_str and params_str not in ("nan", "{}", ""):
-                        params = json.loads(params_str)
-                except:
+                    if params_str not in _EMPTY_TEMPLATES:
+                        params = json_loads(params_str)
+                except (ValueError, TypeError):
+                    # 模板替换后不是合法JSON时不发送params
                     pass
         
         # 处理data（支持字典和字符串类型）
         data = None
         if self.config.data_detail:
             if isinstance(self.config.data_detail, dict):
-                # 检查整个字典是否包含占位符
-                dict_has_placeholder = any(
-                    isinstance(value, str) and '#' in value 
-                    for value in self.config.data_detail.values()
+                # 只替换初始化时找出的占位符键，不含占位符时即为直接复制
+                data = self._fill_placeholders(
+                    self.config.data_detail, self._data_detail_placeholder_keys, company
                 )
-                
-                if dict_has_placeholder:
-                    # 只有包含占位符时才遍历和替换
-                    data = {}
-                    for key, value in self.config.data_detail.items():
-                        if isinstance(value, str) and '#' in value:
-                            data[key] = replace_placeholders(value, company)
-                        else:
-                            data[key] = value
-                else:
-                    # 不包含占位符，直接复制
-                    data = self.config.data_detail.copy()
             else:
                 # 如果是字符串，先检查是否包含占位符，再决定是否替换
                 try:
                     data_str = str(self.config.data_detail)
                     if '#' in data_str:
                         data_str = replace_placeholders(data_str, company)
-                    if data_str and data_str not in ("nan", "{}", ""):
-                        data = json.loads(data_str)
-                except:
+                    if data_str not in _EMPTY_TEMPLATES:
+                        data = json_loads(data_str)
+                except (ValueError, TypeError):
+                    # 模板替换后不是合法JSON时不发送data
                     pass
        
         # 使用动态占位符替换URL（先检查是否包含占位符）
@@ -154,8 +156,9 @@ class DetailFetcher(BaseCrawler):
         
         #print("详情响应数据:", response_data)
         # 提取联系人数据（传递请求信息用于日志）
-        items_key_detail = self.config.items_key_detail or ""
-        info_key = self.config.info_key or {}
+        # 优先使用加载配置时预编译的键路径
+        items_key_detail = self.config.items_key_detail_path or self.config.items_key_detail or ""
+        info_key = self.config.info_paths or self.config.info_key or {}
         
         # 构建请求信息用于日志记录
         request_info = {
@@ -169,12 +172,10 @@ class DetailFetcher(BaseCrawler):
             response_data, 
             items_key_detail, 
             info_key,
-            request_info
+            request_info,
+            extract_fn=self.config._detail_extract_fn
         )
         
-        with self._stats_lock:
-            self._success_count += 1
-        
         return contacts
     
     def _create_empty_contact(self) -> List[Dict[str, Any]]:
@@ -185,6 +186,20 @@ class DetailFetcher(BaseCrawler):
                 contact_info[output_key] = ""
         return [contact_info]
     
+    def _add_success_count(self, count: int) -> int:
+        """
+        把一次批量获取的成功数计入总数（线程安全）
+        
+        Args:
+            count: 本次成功获取的公司数
+        
+        Returns:
+            累计成功数
+        """
+        with self._success_lock:
+            self._success_count += count
+            return self._success_count
+    
     def fetch_batch_contacts_with_basic_info(self, 
                                             companies_basic_info: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -197,14 +212,15 @@ class DetailFetcher(BaseCrawler):
             联系人列表（每个联系人包含公司基本信息和联系人详情）
         """
         results = []
-        
-        results_lock = threading.Lock()
+        # 本次调用的成功数只在本方法内累加，结束时再加锁计入总数
+        success_count = 0
         
         # 如果配置为单线程（max_workers == 1），则改为顺序执行，避免线程池开销
         if getattr(self, 'max_workers', 1) == 1:
             for index, item in enumerate(companies_basic_info):
                 try:
                     contacts_list = self.fetch_company_contacts(item)
+                    success_count += 1
                     basic_info = companies_basic_info[index]
 
                     # 将基本信息合并到每个联系人记录中
@@ -220,39 +236,38 @@ class DetailFetcher(BaseCrawler):
                     company_name = basic_info.get('Company', '未知公司')
                     print(f"❌ 处理公司 {company_name} 时发生异常: {e}", flush=True)
 
-            print(f"✅ 第{self.start_page}页 - 顺序批量获取完成，成功: {self._success_count}", flush=True)
+            print(f"✅ 第{self.start_page}页 - 顺序批量获取完成，成功: {self._add_success_count(success_count)}", flush=True)
             return results
 
-        # 否则使用线程池并发执行（默认行为）
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_index = {
-                executor.submit(self.fetch_company_contacts, item): i 
-                for i, item in enumerate(companies_basic_info)
-            }
-            
-            # 收集结果并合并基本信息
-            for future in as_completed(future_to_index):
-                try:
-                    contacts_list = future.result()  # 联系人列表
-                    index = future_to_index[future]
-                    basic_info = companies_basic_info[index]  # 对应的基本信息
+        # 否则使用线程池并发执行（默认行为），复用同一个线程池，不再每页新建
+        executor = self._get_executor()
+        future_to_index = {
+            executor.submit(self.fetch_company_contacts, item): i 
+            for i, item in enumerate(companies_basic_info)
+        }
+        
+        # 收集结果并合并基本信息
+        for future in as_completed(future_to_index):
+            try:
+                contacts_list = future.result()  # 联系人列表
+                success_count += 1
+                index = future_to_index[future]
+                basic_info = companies_basic_info[index]  # 对应的基本信息
+                
+                # 将基本信息合并到每个联系人记录中
+                for contact in contacts_list:
+                    full_record = basic_info.copy()  # 先复制基本信息
+                    full_record.update(contact)  # 再添加联系人信息
+                    results.append(full_record)
                     
-                    with results_lock:
-
-                        # 将基本信息合并到每个联系人记录中
-                        for contact in contacts_list:
-                            full_record = basic_info.copy()  # 先复制基本信息
-                            full_record.update(contact)  # 再添加联系人信息
-                            results.append(full_record)
-                            
-                        company_name = basic_info.get('Company', '未知公司')
-                        #print(f"✅ 成功获取公司 {company_name} 的 {len(contacts_list)} 个联系人", flush=True)
-                except Exception as e:
-                    index = future_to_index[future]
-                    basic_info = companies_basic_info[index]
-                    company_name = basic_info.get('Company', '未知公司')
-                    print(f"❌ 处理公司 {company_name} 时发生异常: {e}", flush=True)
+                company_name = basic_info.get('Company', '未知公司')
+                #print(f"✅ 成功获取公司 {company_name} 的 {len(contacts_list)} 个联系人", flush=True)
+            except Exception as e:
+                index = future_to_index[future]
+                basic_info = companies_basic_info[index]
+                company_name = basic_info.get('Company', '未知公司')
+                print(f"❌ 处理公司 {company_name} 时发生异常: {e}", flush=True)
 
-        print(f"✅ 第{self.start_page}页 - 批量获取完成，成功: {self._success_count}", flush=True)
+        print(f"✅ 第{self.start_page}页 - 批量获取完成，成功: {self._add_success_count(success_count)}", flush=True)
 
         return results
@@ -4,8 +4,13 @@
 适用于需要先获取列表，再获取详情的场景
 """
 
+import logging
+
 from .base_crawler import BaseCrawler
-from unified_logger import log_error, log_list_progress, log_contacts_saved, console
+from .detail_fetcher import DetailFetcher
+from unified_logger import (
+    log_error, log_info, log_list_progress, log_contacts_saved, console, is_enabled_for
+)
 
 
 class DoubleFetchCrawler(BaseCrawler):
@@ -20,8 +25,13 @@ class DoubleFetchCrawler(BaseCrawler):
     3. 保存这一页的联系人数据到Excel
     4. 继续下一页
     
+    抓取联系人期间，后台会提前请求后续的列表页（见 `LIST_PREFETCH_PAGES`），
+    列表页的请求耗时被详情请求掩盖。
     """
     
+    # 处理当前页联系人时最多预取的列表页数
+    LIST_PREFETCH_PAGES = 1
+    
     def __init__(self, exhibition_code: str, max_workers: int = 4, start_page: int = 1):
         """
         初始化二次请求爬虫
@@ -35,13 +45,38 @@ class DoubleFetchCrawler(BaseCrawler):
         
         # 使用DetailFetcher来获取联系人
         # 注意：此时 self.config 已经在父类初始化时验证过，不会为 None
-        from .detail_fetcher import DetailFetcher
         if self.config is None:
             raise ValueError("配置不能为空")
-        self.detail_fetcher = DetailFetcher(self.config, max_workers=self.max_workers)
+        # 详情请求与列表页请求共用同一个 HttpClient（同一个会话和连接池）
+        self.detail_fetcher = DetailFetcher(
+            self.config, max_workers=self.max_workers, http_client=self.http_client
+        )
+        
+        # 表头 - 基本配置的字段映射 + 联系人字段映射
+        if self.config.info_key:
+            self._headers = self._headers + list(self.config.info_key.keys())
         
         # 二次请求模式的额外统计
         self._total_contacts = 0
+        # 已保存联系人记录的指纹，跨页过滤完全相同的联系人（详情接口重复返回同一联系人时）
+        self._seen_contacts: set[int] = set()
+        self._duplicate_contacts = 0
+    
+    def _reset_stats(self):
+        """
+        重置统计信息（含联系人去重状态）
+        """
+        super()._reset_stats()
+        self._seen_contacts = set()
+        self._duplicate_contacts = 0
+    
+    def close(self):
+        """
+        释放爬虫及详情获取器持有的资源
+        """
+        # 先关闭详情获取器（等待其在途请求完成），再关闭共享的HTTP客户端
+        self.detail_fetcher.close()
+        super().close()
     
     def _print_double_summary(self):
         """
@@ -54,51 +89,60 @@ class DoubleFetchCrawler(BaseCrawler):
         console(f"总页数: {self._total_pages}")
         console(f"总公司数: {self._total_companies}")
         console(f"总联系人数: {self._total_contacts}")
+        if self._duplicate_rows:
+            console(f"跳过重复公司: {self._duplicate_rows}个")
+        if self._duplicate_contacts:
+            console(f"跳过重复联系人: {self._duplicate_contacts}个")
         console("="*60 + "\n")
     
     def crawl(self) -> bool:
         """
         执行爬取流程（二次请求模式 - 逐页处理）
         
-        每获取一页公司列表，就立即抓取联系人并保存，避免数据丢失。
+        每获取一页公司列表，就立即抓取联系人并放入写入缓冲，缓冲满若干页后批量写入Excel；
+        爬取结束、出错或中断时都会写入缓冲中剩余的数据，避免数据丢失。
         
         Returns:
             是否成功获取到数据
         """
 
-        # 确定表头 - 基本配置的字段映射 + 联系人字段映射
-        if self.config is None:
-            raise ValueError("配置不能为空")
-        
-        if self.config.info_key:
-            headers = list(self.config.company_info_keys.keys()) + list(self.config.info_key.keys())
-        else:
-            headers = list(self.config.company_info_keys.keys())
+        headers = self._headers
 
         # 回调：逐页处理（抓取联系人并保存）
         def _process_page(page: int, items: list):
             log_list_progress(page, len(items))
 
-            # 抓取联系人
+            # 跳过之前页已出现过的公司，避免重复请求详情
+            new_items = self._filter_new_rows(items) if items else []
+            if items and not new_items and is_enabled_for(logging.INFO):
+                log_info(f"第{page}页的{len(items)}个公司均已出现过，跳过抓取联系人")
+
+            # 抓取联系人（本页没有新公司时跳过）
             all_contacts = self.detail_fetcher.fetch_batch_contacts_with_basic_info(
-                companies_basic_info=items
-            )
+                companies_basic_info=new_items
+            ) if new_items else []
 
             if all_contacts:
-                try:
-                    self.exporter.save(all_contacts, self.exhibition_code, headers)
-                    self._total_contacts += len(all_contacts)
-                    log_contacts_saved(page, len(all_contacts))
-                except Exception as e:
-                    log_error(f"保存第{page}页联系人数据失败", e)
+                # 过滤掉已保存过的联系人（详情接口重复返回同一联系人时）
+                new_contacts = self._filter_new_rows(all_contacts, self._seen_contacts)
+                self._duplicate_contacts += len(all_contacts) - len(new_contacts)
+                all_contacts = new_contacts
 
-            # 更新公司数统计（保持原行为）
-            self._total_companies += len(items)
-            self._total_pages += 1
+            if all_contacts:
+                if not self._buffer_rows(all_contacts, headers):
+                    log_error(f"之前的联系人数据写入Excel失败，停止爬取（第{page}页）")
+                    return False
+                self._total_contacts += len(all_contacts)
+                log_contacts_saved(page, len(all_contacts))
+
+            # 更新公司数统计（保持原行为：按列表页返回的公司数统计，含已出现过的公司，重复数另见汇总）
+            self._record_page(len(items))
 
             # 继续分页默认
             return True
 
+        has_data = False
+        saved = False
         try:
             # 删除旧文件（如果从第一页开始）
             self._delete_old_file_if_needed()
@@ -108,18 +152,28 @@ class DoubleFetchCrawler(BaseCrawler):
 
             has_data = self.paginate_sequential(
                 start_page=self.start_page,
-                process_page_callback=_process_page
+                process_page_callback=_process_page,
+                prefetch=self.LIST_PREFETCH_PAGES
             )
-            
-            # 显示汇总信息
-            if has_data:
-                self._print_double_summary()
-
-            return has_data
 
         except KeyboardInterrupt:
             log_error("用户中断，已保存的数据不会丢失")
         except Exception as e:
             log_error("爬取过程出错", e)
+        finally:
+            # 写入缓冲中剩余的联系人数据
+            try:
+                saved = self._final_flush(headers)
+            except Exception as e:
+                log_error("写入剩余联系人数据失败", e)
+            self.close()
+
+        if not saved:
+            log_error(f"部分联系人数据未能写入Excel，请检查输出文件: {self._output_path}")
+            return False
+
+        # 显示汇总信息
+        if has_data:
+            self._print_double_summary()
 
-        return False
+        return has_data
@@ -5,14 +5,18 @@ Excel导出模块
 """
 
 import os
+import re
 import threading
 import time
-from typing import Optional
+from typing import Dict, Iterable, Optional, Tuple
 import sys
 
 from openpyxl import Workbook
 from openpyxl.reader.excel import load_workbook
 
+# Excel不允许的控制字符（ASCII 0-31，除了制表符、换行符、回车符），模块加载时编译一次
+_ILLEGAL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
 
 class ExcelExporter:
     """
@@ -45,6 +49,10 @@ class ExcelExporter:
         # 文件锁字典，每个文件一个锁
         self._file_locks = {}
         self._lock_for_locks = threading.Lock()
+        
+        # 已打开的工作簿缓存 {文件路径: (工作簿, 上次保存后的文件状态)}，
+        # 同一文件多次写入时复用内存中的工作簿，不必每次都重新解析整个文件
+        self._workbooks: Dict[str, Tuple[Workbook, Tuple[int, int]]] = {}
     
     def _get_file_lock(self, file_path: str) -> threading.Lock:
         """获取指定文件的锁"""
@@ -53,6 +61,50 @@ class ExcelExporter:
                 self._file_locks[file_path] = threading.Lock()
             return self._file_locks[file_path]
     
+    @staticmethod
+    def _file_state(file_path: str) -> Optional[Tuple[int, int]]:
+        """获取文件的 (修改时间, 大小)，文件不存在时返回 None"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _open_workbook(self, file_path: str, headers: list[str]) -> Workbook:
+        """
+        获取用于追加写入的工作簿
+        
+        文件自上次保存后未被改动时直接复用缓存的工作簿；文件被外部修改或删除时重新加载/创建。
+        
+        Args:
+            file_path: 输出文件完整路径
+            headers: 表头字段列表（新建文件时写入）
+        
+        Returns:
+            工作簿对象
+        """
+        cached = self._workbooks.get(file_path)
+        if cached is not None:
+            workbook, state = cached
+            if self._file_state(file_path) == state:
+                return workbook
+            del self._workbooks[file_path]
+        
+        if os.path.exists(file_path):
+            return load_workbook(file_path)
+        
+        workbook = Workbook()
+        worksheet = workbook.active
+        if worksheet is not None:
+            worksheet.append(headers)
+        return workbook
+    
+    def close(self) -> None:
+        """
+        释放缓存的工作簿（数据已在每次写入时保存到文件）
+        """
+        self._workbooks.clear()
+    
     def save(self, company_list: list[dict], exhibition_code: str, headers: list[str]) -> bool:
         """
         保存公司列表到Excel文件（线程安全）
@@ -68,7 +120,44 @@ class ExcelExporter:
         if not company_list:
             return True
         
-        file_path = os.path.join(self.output_dir, f"{exhibition_code}.xlsx")
+        return self.save_many(company_list, exhibition_code, headers)
+    
+    def save_many(self, rows: Iterable[dict], exhibition_code: str, headers: list[str]) -> bool:
+        """
+        将多批数据一次性写入Excel文件（线程安全，只打开/保存一次工作簿）
+        
+        Args:
+            rows: 公司信息的可迭代对象（可由多页数据拼接而成）
+            exhibition_code: 展会代码（用作文件名）
+            headers: 表头字段列表
+        
+        Returns:
+            是否保存成功
+        """
+        return self.save_to(self.get_file_path(exhibition_code), rows, headers)
+    
+    def save_to(self, file_path: str, rows: Iterable[dict], headers: list[str]) -> bool:
+        """
+        将数据写入指定路径的Excel文件（线程安全，只打开/保存一次工作簿）
+        
+        供已缓存输出路径的调用方使用，避免每次写入都重新拼接路径。
+        
+        Args:
+            file_path: 输出文件完整路径（通常来自 `get_file_path`）
+            rows: 公司信息的可迭代对象（可由多页数据拼接而成）
+            headers: 表头字段列表
+        
+        Returns:
+            是否保存成功
+        """
+        # 先取出第一行判断是否为空，避免为空数据创建文件
+        rows = iter(rows)
+        first_row = next(rows, None)
+        if first_row is None:
+            return True
+        # 物化为列表，保证文件被占用重试时能重新写入全部数据
+        company_list = [first_row, *rows]
+        
         file_lock = self._get_file_lock(file_path)
         
         # 使用文件锁保护写入操作
@@ -79,33 +168,26 @@ class ExcelExporter:
             
             for attempt in range(max_retries):
                 try:
-                    # 加载或创建工作簿
-                    if os.path.exists(file_path):
-                        workbook = load_workbook(file_path)
-                        worksheet = workbook.active
-                    else:
-                        workbook = Workbook()
-                        worksheet = workbook.active
-                        if worksheet is not None:
-                            worksheet.append(headers)
+                    # 加载或创建工作簿（优先复用上次保存后缓存的工作簿）
+                    workbook = self._open_workbook(file_path, headers)
+                    worksheet = workbook.active
+                    # 写入失败时内存中的工作簿可能已追加了部分数据，丢弃缓存，重试时从文件重新加载
+                    self._workbooks.pop(file_path, None)
                     
                     # 写入数据行
                     if worksheet is not None:
+                        append = worksheet.append
                         for company in company_list:
                             # 直接获取数据，不添加前缀空格，避免Excel格式错误
-                            row_data = []
-                            for header in headers:
-                                value = company.get(header, '')
-                                # 清理控制字符，避免Excel保存错误
-                                if isinstance(value, str):
-                                    # 移除控制字符（ASCII 0-31，除了制表符、换行符、回车符）
-                                    cleaned_value = ''.join(char for char in value if ord(char) >= 32 or char in '\t\n\r')
-                                    row_data.append(cleaned_value)
-                                else:
-                                    row_data.append(value)
-                            worksheet.append(row_data)
+                            row_data = [company.get(header, '') for header in headers]
+                            # 清理控制字符，避免Excel保存错误（正则在C层扫描，绝大多数值不含控制字符，无需重建字符串）
+                            for i, value in enumerate(row_data):
+                                if isinstance(value, str) and _ILLEGAL_CHARS_RE.search(value):
+                                    row_data[i] = _ILLEGAL_CHARS_RE.sub('', value)
+                            append(row_data)
                     
                     workbook.save(file_path)
+                    self._workbooks[file_path] = (workbook, self._file_state(file_path))
                     return True
                     
                 except PermissionError:
@@ -8,3 +8,8 @@
 class ParseError(Exception):
     """表示从响应体解析列表数据失败的错误（用于分页停止判定）。"""
     pass
+
+
+class RequestCancelled(Exception):
+    """表示请求在重试等待期间被调用方取消（如预取列表页时调用方已停止翻页）。"""
+    pass
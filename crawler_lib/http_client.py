@@ -7,18 +7,31 @@ HTTP请求客户端模块
 
 import ast
 import json
+import threading
 import time
 import random
-from typing import Any, Dict, Optional
+from contextlib import contextmanager
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
 from urllib.parse import urlencode, unquote
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
 
 from .config_manager import CrawlerConfig
+from .exceptions import RequestCancelled
+from .utils import json_loads, bytes_fingerprint
 # 导入新的简化日志系统
 from unified_logger import log_request, log_error
 
 
+# 默认User-Agent（模拟微信小程序环境），会覆盖配置中的User-Agent
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36 MicroMessenger/7.0.20.1781(0x6700143B) NetType/WIFI MiniProgramEnv/Windows WindowsWechat/WMPF WindowsWechat(0x63090a13) UnifiedPCWindowsWechat(0xf2541518) XWEB/17071"
+
+# 单个响应体（解压后）的最大字节数，超过时中止读取，防止异常响应占满内存
+MAX_RESPONSE_BYTES = 64 * 1024 * 1024
+
 # 限流检测关键词
 RATE_LIMIT_KEYWORDS = [
     '频繁', '限流', '访问受限', '请稍后', '请求过快' ,'超时',
@@ -31,92 +44,229 @@ class HttpClient:
     HTTP请求客户端
     
     封装HTTP请求的构建和发送逻辑。
+    所有请求复用同一个 requests.Session（连接池 + keep-alive），
+    避免每个请求都重新建立 TCP/TLS 连接。
+    
+    并发模型：同步请求 + 爬虫复用的小线程池（max_workers 通常为 1~8，以免触发反爬），
+    连接池大小按线程数配置，保证每个线程都能复用长连接；在这个并发量下线程开销可以忽略，
+    因此不引入 asyncio 客户端。
     """
     
+    def __init__(self, max_workers: int = 4):
+        """
+        初始化HTTP客户端
+        
+        Args:
+            max_workers: 并发线程数，用于确定连接池大小
+        """
+        self._session = requests.Session()
+        # User-Agent 作为会话默认请求头，逐请求传入的请求头只读使用，无需每次复制
+        self._session.headers["User-Agent"] = DEFAULT_USER_AGENT
+        # 与逐次调用 requests.get/post 保持一致：不在请求之间保留服务端下发的 Cookie
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(max_workers * 2, 1), max_retries=0)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # 每个线程最近一次成功响应的原始响应体指纹（供列表页判断响应体是否与上次完全相同），
+        # 以及当前线程登记的取消事件（见 `cancel_on`）
+        self._local = threading.local()
+    
+    def last_body_hash(self) -> Optional[int]:
+        """
+        获取当前线程最近一次成功请求的原始响应体指纹
+        
+        Returns:
+            64位整数指纹，尚无成功请求时返回None
+        """
+        return getattr(self._local, 'last_body_hash', None)
+    
+    @contextmanager
+    def cancel_on(self, event: threading.Event) -> Iterator[None]:
+        """
+        在当前线程中登记取消事件：事件置位后，限流重试的等待立即结束，
+        不再发出新的请求并抛出 `RequestCancelled`（正在进行的单次请求仍受 timeout 限制）
+        
+        Args:
+            event: 取消事件
+        """
+        previous = getattr(self._local, 'cancel', None)
+        self._local.cancel = event
+        try:
+            yield
+        finally:
+            self._local.cancel = previous
+    
+    def close(self) -> None:
+        """关闭会话，释放连接池中的连接"""
+        self._session.close()
+    
     @staticmethod
-    def _process_dict_placeholders(data_dict: Any, page: int, skip_count: int) -> Any:
+    def _read_body(response: requests.Response) -> bytes:
         """
-        递归处理字典中的占位符
+        分块读取（stream=True 的）响应体，超过 `MAX_RESPONSE_BYTES` 时中止
+        
+        返回的字节直接交给 `parse_response` 解析（流已读完，不能再通过 response.content / response.text 读取）。
         
         Args:
-            data_dict: 要处理的数据（可能是字典、列表或其他类型）
-            page: 当前页码
-            skip_count: 跳过的记录数
+            response: 以 stream=True 发出的请求的响应对象
         
         Returns:
-            处理后的数据
+            解压后的响应体字节
+        
+        Raises:
+            ValueError: 响应体超过大小上限时抛出
         """
-        if isinstance(data_dict, dict):
-            processed_dict = {}
-            for key, value in data_dict.items():
-                if isinstance(value, str):
-                    # 检查是否包含#page占位符
-                    if "#page" in value:
-                        # 如果是纯#page占位符，替换为数字
-                        if value.strip() == "#page":
-                            processed_dict[key] = page  # 直接使用数字类型
-                        else:
-                            # 如果是包含#page的复合字符串，替换为字符串
-                            processed_dict[key] = value.replace("#page", str(page)).replace("#skipCount", str(skip_count))
-                    else:
-                        # 不包含占位符，普通字符串处理
-                        processed_dict[key] = value.replace("#page", str(page)).replace("#skipCount", str(skip_count))
-                else:
-                    # 递归处理嵌套结构
-                    processed_dict[key] = HttpClient._process_dict_placeholders(value, page, skip_count)
-            return processed_dict
-        elif isinstance(data_dict, list):
-            # 处理列表中的每个元素
-            return [HttpClient._process_dict_placeholders(item, page, skip_count) for item in data_dict]
-        else:
-            # 其他类型直接返回
-            return data_dict
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > MAX_RESPONSE_BYTES:
+            response.close()
+            raise ValueError(f"响应体过大: Content-Length={content_length}，上限{MAX_RESPONSE_BYTES}字节")
+        
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > MAX_RESPONSE_BYTES:
+                response.close()
+                raise ValueError(f"响应体过大: 已超过上限{MAX_RESPONSE_BYTES}字节")
+            chunks.append(chunk)
+        
+        return b"".join(chunks)
     
     @staticmethod
-    def build_request_params(config: CrawlerConfig, page: int, page_size: int = 20) -> tuple[str, str]:
+    def _compile_placeholders(
+        obj: Any,
+        replace_keys: bool = False,
+        page_as_int: bool = False
+    ) -> Optional[Callable[[int, int], Any]]:
         """
-        构建列表页请求参数，替换分页占位符
+        将含分页占位符（#page / #skipCount）的模板预编译为 (page, skip_count) -> 替换结果 的构建函数
+        
+        字符串编译为一次 str.format（原有的花括号会被转义保留）；字典和列表只重建含占位符的路径，
+        不含占位符的值和子结构在各页之间共享，不再逐页遍历和复制。
+        
+        Args:
+            obj: 模板（字符串、字典或列表，可嵌套）
+            replace_keys: 是否也替换字典键中的占位符（params按"序列化 -> 替换 -> 重新解析"的语义处理键和值）
+            page_as_int: 值恰好为 "#page" 时是否替换为数字而不是字符串（请求体data的语义）
+        
+        Returns:
+            构建函数；模板中不含分页占位符时返回None
+        """
+        if isinstance(obj, str):
+            if "#page" not in obj and "#skipCount" not in obj:
+                return None
+            if page_as_int and obj.strip() == "#page":
+                return lambda page, skip_count: page
+            template = (
+                obj.replace("{", "{{").replace("}", "}}")
+                .replace("#page", "{0}").replace("#skipCount", "{1}")
+            )
+            return template.format
+        
+        if isinstance(obj, dict):
+            entries = [
+                (
+                    key,
+                    HttpClient._compile_placeholders(key) if replace_keys else None,
+                    value,
+                    HttpClient._compile_placeholders(value, replace_keys, page_as_int),
+                )
+                for key, value in obj.items()
+            ]
+            if not any(key_builder or value_builder for _, key_builder, _, value_builder in entries):
+                return None
+            
+            def build_dict(page: int, skip_count: int) -> dict:
+                return {
+                    (key if key_builder is None else key_builder(page, skip_count)):
+                        (value if value_builder is None else value_builder(page, skip_count))
+                    for key, key_builder, value, value_builder in entries
+                }
+            return build_dict
+        
+        if isinstance(obj, list):
+            item_builders = [HttpClient._compile_placeholders(item, replace_keys, page_as_int) for item in obj]
+            if not any(item_builders):
+                return None
+            
+            def build_list(page: int, skip_count: int) -> list:
+                return [
+                    item if builder is None else builder(page, skip_count)
+                    for item, builder in zip(obj, item_builders)
+                ]
+            return build_list
+        
+        return None
+    
+    @staticmethod
+    def compile_request_params(config: CrawlerConfig, page_size: int = 20) -> Callable[[int], tuple[Any, Any]]:
+        """
+        为配置生成专用的列表页请求参数构建函数 page -> (params, data)，替换分页占位符
+        
+        params/data模板只在这里序列化、解析和编译一次，每页只做占位符替换；
+        两者都不含分页占位符时返回的函数直接返回常量。
         
         Args:
             config: 爬虫配置
-            page: 当前页码
             page_size: 每页记录数，默认20
         
         Returns:
-            处理后的(params, data)元组
+            只接收页码的请求参数构建函数，返回(params, data)：params为字典或None，data为可直接发送的请求数据
         """
-        # 计算跳过的记录数
-        skip_count = (page - 1) * page_size
-        
-        # 替换分页占位符
-        replacements = {
-            "#page": str(page),
-            "#skipCount": str(skip_count)
-        }
+        headers = config.headers or {}
         
-        # 处理params字段（简化逻辑：统一转字符串处理）
+        # 处理params：与原逻辑一致，统一转字符串，跳过空值
         params_str = json.dumps(config.params) if isinstance(config.params, dict) else str(config.params or "")
-        if "#page" in params_str or "#skipCount" in params_str:
-            for placeholder, value in replacements.items():
-                params_str = params_str.replace(placeholder, value)
+        params_template = None
+        build_params = None
+        if params_str not in ("nan", "{}", "", "None"):
+            try:
+                params_template = json_loads(params_str)
+            except (ValueError, TypeError):
+                # 模板不是合法JSON（如占位符未加引号），每页替换占位符后再解析
+                format_params = HttpClient._compile_placeholders(params_str)
+                if format_params is not None:
+                    def build_params(page: int, skip_count: int) -> Any:
+                        try:
+                            return json_loads(format_params(page, skip_count))
+                        except (ValueError, TypeError):
+                            return None
+            else:
+                build_params = HttpClient._compile_placeholders(params_template, replace_keys=True)
         
-        # 处理data字段（支持字典和字符串类型）
+        # 处理data：字典按Content-Type决定是否转为表单，字符串（如GraphQL查询）替换后再按Content-Type解析
+        data_template = None
+        build_data = None
         if isinstance(config.data, dict):
-            # 使用递归处理嵌套结构中的占位符
-            data = HttpClient._process_dict_placeholders(config.data, page, skip_count)
-            data_str = json.dumps(data)
-        elif isinstance(config.data, str):
-            # 如果是字符串（如GraphQL查询），直接替换占位符
-            data_str = config.data
-            for placeholder, value in replacements.items():
-                data_str = data_str.replace(placeholder, value)
+            build_dict = HttpClient._compile_placeholders(config.data, page_as_int=True)
+            urlencoded = "urlencoded" in headers.get("Content-Type", "")
+            if build_dict is None:
+                data_template = urlencode(config.data) if urlencoded else config.data
+            elif urlencoded:
+                build_data = lambda page, skip_count: urlencode(build_dict(page, skip_count))
+            else:
+                build_data = build_dict
         else:
-            # 其他情况，转换为字符串处理
-            data_str = str(config.data or "")
-            for placeholder, value in replacements.items():
-                data_str = data_str.replace(placeholder, value)
+            data_str = config.data if isinstance(config.data, str) else str(config.data or "")
+            format_data = HttpClient._compile_placeholders(data_str)
+            if format_data is None:
+                data_template = HttpClient.prepare_request_data(data_str, headers)
+            else:
+                build_data = lambda page, skip_count: HttpClient.prepare_request_data(
+                    format_data(page, skip_count), headers
+                )
         
-        return params_str, data_str
+        if build_params is None and build_data is None:
+            constant = (params_template, data_template)
+            return lambda page: constant
+        
+        def build(page: int) -> tuple[Any, Any]:
+            skip_count = (page - 1) * page_size
+            return (
+                params_template if build_params is None else build_params(page, skip_count),
+                data_template if build_data is None else build_data(page, skip_count),
+            )
+        return build
     
     @staticmethod
     def prepare_request_data(data_str: str, headers: dict) -> Any:
@@ -136,7 +286,7 @@ class HttpClient:
         content_type = headers.get("Content-Type", "")
         
         try:
-            data_dict = json.loads(data_str)
+            data_dict = json_loads(data_str)
             if "urlencoded" in content_type:
                 return urlencode(data_dict)
             return data_dict
@@ -144,18 +294,46 @@ class HttpClient:
             return data_str
     
     @staticmethod
-    def parse_response(response: requests.Response) -> dict | list:
+    def _response_text(body: bytes, encoding: Optional[str] = None) -> str:
+        """
+        将响应体字节解码为文本（只解码一次，规则与 response.text 相同）
+        
+        响应未声明编码时，探测编码（charset_normalizer/chardet，纯Python，大响应体很慢）之前
+        先直接按 UTF-8 解码：JSON 按规范为 UTF-8，不是合法 UTF-8 时才探测。
+        
+        Args:
+            body: 响应体字节
+            encoding: 响应头声明的编码（response.encoding），未声明时为None
+        
+        Returns:
+            解码后的响应体文本
+        """
+        if not body:
+            return ""
+        if encoding is None:
+            try:
+                return body.decode('utf-8')
+            except UnicodeDecodeError:
+                encoding = chardet.detect(body)["encoding"] if chardet is not None else None
+        try:
+            return str(body, encoding or 'utf-8', errors='replace')
+        except (LookupError, TypeError):
+            return str(body, errors='replace')
+    
+    @staticmethod
+    def parse_response(body: bytes, encoding: Optional[str] = None) -> dict | list:
         """
         智能解析响应体，支持多种格式
         
         尝试顺序：
-        1. response.json() - 标准JSON解析
-        2. json.loads(response.text) - 处理一些特殊编码
-        3. ast.literal_eval(response.text) - 处理Python字面量格式
+        1. json_loads(body) - 直接解析原始字节（优先 orjson，跳过文本解码）
+        2. json_loads(text) - 按响应编码解码后解析，处理一些特殊编码
+        3. ast.literal_eval(text) - 处理Python字面量格式
         4. ast.literal_eval + json.loads - 处理双重编码
         
         Args:
-            response: requests响应对象
+            body: 响应体字节（见 `_read_body`）
+            encoding: 响应头声明的编码（response.encoding），未声明时为None
         
         Returns:
             解析后的或列表数据
@@ -163,30 +341,32 @@ class HttpClient:
         Raises:
             ValueError: 所有解析方法均失败时抛出
         """
-        # 方法1: 尝试使用标准的 response.json()
+        # 方法1: 直接解析原始字节，不生成解码后的文本副本
+        # （非UTF编码如GBK会在这里失败，交给方法2按响应声明的编码解码后解析）
         try:
-            result = response.json()
+            result = json_loads(body)
             if isinstance(result, dict):
                 return result
             # 如果返回的是字符串，尝试继续解析
             elif isinstance(result, str):
                 try:
-                    return json.loads(result)
+                    return json_loads(result)
                 except:
                     pass
             return result
         except (json.JSONDecodeError, ValueError) as e1:
             error_msg_1 = str(e1)
             
-            # 方法2: 尝试使用 json.loads(response.text)
+            # 方法2: 尝试解析按响应编码解码后的文本（之后的方法复用同一份文本，不再重复解码）
+            text = HttpClient._response_text(body, encoding)
             try:
-                result = json.loads(response.text)
+                result = json_loads(text)
                 if isinstance(result, dict):
                     return result
                 elif isinstance(result, str):
                     # 可能是双重编码的JSON字符串
                     try:
-                        return json.loads(result)
+                        return json_loads(result)
                     except:
                         pass
                 return result
@@ -195,14 +375,14 @@ class HttpClient:
                 
                 # 方法3: 尝试使用 ast.literal_eval (适用于Python字面量格式)
                 try:
-                    result = ast.literal_eval(response.text)
+                    result = ast.literal_eval(text)
                     # 确保返回的是字典类型
                     if isinstance(result, dict):
                         return result
                     elif isinstance(result, str):
                         # ast.literal_eval返回了字符串，尝试再次JSON解析
                         try:
-                            return json.loads(result)
+                            return json_loads(result)
                         except:
                             pass
                     raise ValueError(f"ast.literal_eval返回了非字典类型: {type(result)}")
@@ -211,7 +391,7 @@ class HttpClient:
                     return {
                         "__needs_retry__": True,
                         "error": "响应非JSON格式，所有解析方法均失败",
-                        "original_text": response.text[:500],
+                        "original_text": text[:500],
                         "error_details": (
                             f"1. response.json(): {error_msg_1}\n"
                             f"2. json.loads(): {error_msg_2}\n"
@@ -269,11 +449,11 @@ class HttpClient:
         # 都没有检测到失败标识，认为成功
         return True, ""
     
-    @staticmethod
     def send_request_with_retry(
+        self,
         url: str,
         method: str = 'GET',
-        headers: Optional[Dict] = None,
+        headers: Optional[Mapping[str, Any]] = None,
         params: Optional[Dict] = None,
         data: Optional[Dict] = None,
         timeout: int = 30,
@@ -307,11 +487,20 @@ class HttpClient:
         #print("data",data)
         
         attempt = 0
+        # 请求头按只读处理（配置中为共享的 MappingProxyType）；
+        # 仅当配置自带 User-Agent 时才复制一份并覆盖为默认值，否则直接使用会话默认 User-Agent
         headers = headers or {}
-        headers["User-Agent"]="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36 MicroMessenger/7.0.20.1781(0x6700143B) NetType/WIFI MiniProgramEnv/Windows WindowsWechat/WMPF WindowsWechat(0x63090a13) UnifiedPCWindowsWechat(0xf2541518) XWEB/17071"
+        if any(key.lower() == "user-agent" for key in headers):
+            headers = {key: value for key, value in headers.items() if key.lower() != "user-agent"}
+            headers["User-Agent"] = DEFAULT_USER_AGENT
         
+        cancel = getattr(self._local, 'cancel', None)
         while True:
+            if cancel is not None and cancel.is_set():
+                raise RequestCancelled(f"{context} 请求已取消")
             attempt += 1
+            response = None
+            body = None
             
             try:
                 # 对 params 中可能已经被百分号编码的值进行一次解码，
@@ -328,26 +517,26 @@ class HttpClient:
                     except Exception:
                         # 解码失败时保持原样
                         pass
-                # 发送请求
+                # 发送请求（POST 按 Content-Type 决定以 JSON 还是表单发送请求体，其它方法按 GET 处理）
+                body_kwargs = {}
                 if method.upper() == 'POST':
+                    http_method = 'POST'
                     content_type = headers.get('Content-Type', '').lower()
                     if 'application/json' in content_type:
-                        response = requests.post(
-                            url, json=data, params=params, 
-                            headers=headers, verify=False, timeout=timeout
-                        )
+                        body_kwargs['json'] = data
                     else:
-                        response = requests.post(
-                            url, data=data, params=params, 
-                            headers=headers, verify=False, timeout=timeout
-                        )
+                        body_kwargs['data'] = data
                 else:
-                    response = requests.get(
-                        url, params=params, headers=headers, 
-                        verify=False, timeout=timeout
-                    )
+                    http_method = 'GET'
+                response = self._session.request(
+                    http_method, url, params=params, headers=headers,
+                    verify=False, timeout=timeout, stream=True, **body_kwargs
+                )
                 
-                response_data = HttpClient.parse_response(response)
+                # 流式读取响应体并检查大小上限
+                body = HttpClient._read_body(response)
+                
+                response_data = HttpClient.parse_response(body, response.encoding)
                 
                 # 检查是否需要重试（非JSON格式响应）
                 if isinstance(response_data, dict) and response_data.get("__needs_retry__"):
@@ -360,7 +549,11 @@ class HttpClient:
                     wait_time = HttpClient.calculate_retry_delay(attempt)
                     print(f"❌ {context} 请求失败触发限流重试机制,触发原因：{reason}: ", flush=True)
                     print(f"⚠️ {context} - 第{attempt}次重试，等待{wait_time:.0f}秒...", flush=True)
-                    time.sleep(wait_time)
+                    if cancel is not None:
+                        # 等待期间被取消时立即结束等待，下一轮循环开始时抛出 RequestCancelled
+                        cancel.wait(wait_time)
+                    else:
+                        time.sleep(wait_time)
                     
                     log_request(
                             url=url,
@@ -376,21 +569,17 @@ class HttpClient:
                     if attempt > 1:
                         print(f"✅ {context} 第{attempt}次重试成功", flush=True)
                     
+                    self._local.last_body_hash = bytes_fingerprint(body)
                     return response_data
                 
             except Exception as e:
-                # 尝试安全获取响应体文本（可能在异常前未定义 response）
+                # 尝试安全获取响应体文本（异常可能发生在收到响应或读完响应体之前）
                 resp_text = None
-                status_code = None
-                response = None  # 确保变量被定义
+                status_code = getattr(response, 'status_code', None)
                 try:
-                    # 检查是否有 response 对象可用
-                    if 'response' in locals():
-                        status_code = getattr(response, 'status_code', None)
-                        # 有些响应可能非常大，截取前2000字符保存
-                        resp_text = getattr(response, 'text', None)
-                        if resp_text is not None:
-                            resp_text = resp_text[:500]
+                    # 有些响应可能非常大，只解码并保存前500字符
+                    if body is not None:
+                        resp_text = HttpClient._response_text(body, response.encoding)[:500]
                 except Exception:
                     resp_text = None
 
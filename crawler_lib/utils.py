@@ -4,9 +4,98 @@
 提供通用的辅助函数
 """
 
+import hashlib
+import json
 import time
 import re
-from typing import Any, Dict, Optional,List
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, List, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:  # xxhash 为可选依赖，未安装时回退到 hashlib.blake2b
+    xxhash = None
+
+# 占位符 #key（模块加载时编译一次）
+_PLACEHOLDER_RE = re.compile(r'#([a-zA-Z0-9._]+)')
+
+
+@lru_cache(maxsize=256)
+def _compile_template(template: str) -> Tuple[str, ...]:
+    """
+    把模板按占位符切分为 (文本, 键名, 文本, 键名, ..., 文本)
+    
+    详情请求模板固定，按模板缓存，不再每次请求都做正则匹配；替换时一次拼接完成，
+    不再对每个占位符各扫描一遍整个字符串。
+    """
+    return tuple(_PLACEHOLDER_RE.split(template))
+
+
+def json_loads(data: str | bytes) -> Any:
+    """
+    解析JSON字符串，优先使用 orjson（C 实现，解析更快），未安装时回退到标准库
+
+    orjson 比标准库更严格（如不接受 NaN），解析失败时再用标准库重试一次，
+    保证解析结果与原来使用 json.loads 时一致。
+
+    Args:
+        data: JSON字符串或字节串
+
+    Returns:
+        解析后的对象（dict/list等），失败时抛出 json.JSONDecodeError
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def content_fingerprint(obj: Any) -> int:
+    """
+    计算JSON兼容对象的64位内容指纹
+    
+    按键排序序列化后再哈希，因此与字典键顺序无关，可代替对整页数据的深度 == 比较，
+    且只需保存一个整数而不是整页数据。
+    
+    Args:
+        obj: JSON兼容对象（通常是一页解析后的数据列表）
+    
+    Returns:
+        64位整数指纹
+    """
+    payload = None
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # 超出64位的整数等 orjson 不支持的值，交给标准库处理
+            payload = None
+    if payload is None:
+        payload = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    
+    return bytes_fingerprint(payload)
+
+
+def bytes_fingerprint(data: bytes) -> int:
+    """
+    计算字节串的64位指纹（优先 xxhash，未安装时回退到 blake2b）
+    
+    Args:
+        data: 字节串（如原始响应体）
+    
+    Returns:
+        64位整数指纹
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
 
 
 def replace_placeholders(template: str, data: Dict[str, Any]) -> str:
@@ -23,29 +112,120 @@ def replace_placeholders(template: str, data: Dict[str, Any]) -> str:
     if not template or not isinstance(template, str):
         return template
     
-    import re
-    # 查找所有占位符 #key
-    placeholder_pattern = r'#([a-zA-Z0-9._]+)'
-    placeholders = re.findall(placeholder_pattern, template)
+    # 按占位符切分后的片段：偶数位为原文，奇数位为占位符键名
+    parts = _compile_template(template)
+    if len(parts) == 1:
+        return template
     
-    result = template
-    for placeholder in placeholders:
-        # 直接从映射后的数据中获取值
-        if placeholder in data:
-            value = data[placeholder]
-            if value is not None and value != "":
-                result = result.replace(f"#{placeholder}", str(value))
+    pieces = list(parts)
+    for i in range(1, len(parts), 2):
+        # 直接从映射后的数据中获取值，没有值时保留占位符原样
+        value = data.get(parts[i])
+        pieces[i] = str(value) if value is not None and value != "" else "#" + parts[i]
     
-    return result
+    return "".join(pieces)
         
 
-def get_nested_value(data: Any, key_path: str) -> Any:
+def compile_key_path(key_path: Optional[str]) -> Tuple[str, ...]:
+    """
+    将点号分隔的键路径预先拆分为键元组，供 `get_nested_value` 反复使用
+    
+    Args:
+        key_path: 使用点号分隔的键路径，如 "data.items.0.name"；空路径返回空元组（即返回数据本身）
+    
+    Returns:
+        键元组，如 ("data", "items", "0", "name")
+    """
+    if not key_path:
+        return ()
+    return tuple(key_path.split('.'))
+
+
+def compile_field_paths(field_mappings: Optional[Dict[str, str]]) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """
+    将字段映射 {输出字段名: 源数据路径} 预编译为 ((输出字段名, 键元组), ...)
+    
+    Args:
+        field_mappings: 字段映射配置
+    
+    Returns:
+        预编译的字段路径元组
+    """
+    if not field_mappings:
+        return ()
+    # 非字符串路径原样保留，由 get_nested_value 按原逻辑处理
+    return tuple(
+        (output_field, compile_key_path(source_path) if isinstance(source_path, str) or not source_path else source_path)
+        for output_field, source_path in field_mappings.items()
+    )
+
+
+def compile_field_extractor(field_paths: Iterable[Tuple[str, Any]]) -> Optional[Callable[[Any], Dict[str, Any]]]:
+    """
+    根据预编译的字段路径生成专用的提取函数（运行时代码生成）
+    
+    为每个字段生成展开后的取值代码（键名和列表下标在生成时确定），
+    与逐字段调用 `get_nested_value` 的结果完全一致，但省去了每条数据、每个字段的通用路径遍历。
+    
+    Args:
+        field_paths: 预编译的字段路径 ((输出字段名, 键元组), ...)（见 `compile_field_paths`）
+    
+    Returns:
+        提取函数 extract(item) -> {输出字段名: 值}；存在无法生成代码的路径时返回None
+    
+    Examples:
+        >>> extract = compile_field_extractor(compile_field_paths({"Company": "info.name"}))
+        >>> extract({"info": {"name": "公司A"}})
+        {'Company': '公司A'}
+    """
+    lines = []
+    getters = []
+    # 数据行为字典时（绝大多数情况），单层路径（含输出字段名与源字段同名的直接映射）直接内联为 item.get，
+    # 省去取值函数调用和类型判断
+    dict_getters = []
+    for field_index, (output_field, keys) in enumerate(field_paths):
+        if not isinstance(keys, tuple):
+            return None
+        getter = f"_get_{field_index}"
+        if len(keys) == 1:
+            dict_getters.append(f"{output_field!r}: item.get({keys[0]!r})")
+        elif keys:
+            dict_getters.append(f"{output_field!r}: {getter}(item)")
+        else:
+            dict_getters.append(f"{output_field!r}: item")
+        lines.append(f"def {getter}(c):")
+        for key in keys:
+            lines.append("    if isinstance(c, dict):")
+            lines.append(f"        c = c.get({key!r})")
+            lines.append("    elif isinstance(c, list):")
+            try:
+                index = int(key)
+            except ValueError:
+                # 键不是数字，无法访问列表属性
+                lines.append("        return None")
+            else:
+                lines.append(f"        c = c[{index}] if {index} < len(c) else None")
+        lines.append("    return c")
+        getters.append(f"{output_field!r}: {getter}(item)")
+    
+    lines.append("def extract(item):")
+    lines.append("    if isinstance(item, dict):")
+    lines.append(f"        return {{{', '.join(dict_getters)}}}")
+    lines.append(f"    return {{{', '.join(getters)}}}")
+    
+    namespace: Dict[str, Any] = {}
+    exec(compile('\n'.join(lines), '<field_extractor>', 'exec'), namespace)
+    return namespace['extract']
+
+
+def get_nested_value(data: Any, key_path: str | Iterable[str]) -> Any:
     """
     从嵌套的JSON数据中获取指定路径的值，提取失败会给默认值不会抛出异常
     
     Args:
         data: JSON格式的数据（字典或列表）
-        key_path: 使用点号分隔的键路径，如 "data.items.0.name"
+        key_path: 使用点号分隔的键路径，如 "data.items.0.name"；
+            也可以是预先拆分好的键序列（见 `compile_key_path`），避免重复拆分字符串
     
     Returns:
         键路径对应的值，如果路径无效则抛出异常。
@@ -63,8 +243,10 @@ def get_nested_value(data: Any, key_path: str) -> Any:
     if not key_path:
         return data
     
+    keys = key_path.split('.') if isinstance(key_path, str) else key_path
+    
     current = data
-    for key in key_path.split('.'):
+    for key in keys:
         if isinstance(current, dict):
             current = current.get(key, None)
         elif isinstance(current, list):
@@ -11,7 +11,7 @@
     # 指定线程数
     python run_crawler.py 无人机展 --workers 8
     
-    # 二次请求模式会自动识别（根据config.xlsx中的request_mode字段）
+    # 二次请求模式会自动识别（根据config/目录下JSON配置中的request_mode字段）
     python run_crawler.py 农产品
 """
 
@@ -102,7 +102,7 @@ def main():
             print("\n支持两种模式:")
             print("  1. 单次请求模式: 直接从API获取完整数据")
             print("  2. 二次请求模式: 先获取列表，再获取详情")
-            print("\n模式由config.xlsx中的request_mode字段决定")
+            print("\n模式由config/目录下JSON配置中的request_mode字段决定")
             print("  - request_mode = 'single' (默认)")
             print("  - request_mode = 'double'")
             print("\n示例:")
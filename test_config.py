@@ -210,15 +210,15 @@ class ConfigTester(BaseCrawler):
             print(f"  第1页数据条数: {page1_count}")
             print(f"  第2页数据条数: {page2_count}")
             
-            # 使用BaseCrawler的_is_same_data方法检测重复数据
+            # 使用BaseCrawler的整页指纹检测重复数据
             if page1_count == 0:
                 print(f"❌ 翻页测试失败：第1页没有数据，无法验证翻页功能")
                 return False
             
             # 检查第2页是否有数据（某些情况下第2页可能没有数据）
             if page2_count > 0:
-                # 检查数据是否重复（使用crawler.py相同的方法）
-                is_same = page1_items == page2_items
+                # 检查数据是否重复（与爬虫分页停止判定相同：比较整页指纹）
+                is_same = self._page_signature(page1_items)[0] == self._page_signature(page2_items)[0]
                 
                 if is_same:
                     print(f"⚠️  警告：第1页和第2页的数据相同，可能存在翻页问题")
@@ -449,7 +449,7 @@ def main():
         
     except ValueError as e:
         print(f"\n❌ 错误: {e}")
-        print(f"提示: 请检查展会代码是否在config.xlsx中存在")
+        print(f"提示: 请检查config/目录中是否存在该展会代码的JSON配置")
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ 测试过程中发生错误: {e}")
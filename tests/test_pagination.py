@@ -0,0 +1,201 @@
+"""
+分页引擎测试
+
+用桩HTTP客户端代替真实请求，覆盖出错页重试一次、近似重复页停止、跨页去重和缓冲写入的最终刷新。
+"""
+
+import os
+import sys
+import threading
+from urllib.parse import parse_qs
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler_lib.base_crawler import BaseCrawler
+from crawler_lib.http_client import HttpClient
+
+# 使用仓库自带的展会配置：POST表单，pageNum 为 "#page"，数据位于 data 字段
+EXHIBITION_CODE = "CBME"
+PER_PAGE = 10
+
+
+def page_of(data) -> int:
+    """从表单请求体中取出页码"""
+    return int(parse_qs(data)["pageNum"][0])
+
+
+class StubHttpClient(HttpClient):
+    """按页码返回预置数据的HTTP客户端，可让指定页第一次请求时出错"""
+
+    def __init__(self, pages, fail_once=()):
+        super().__init__(max_workers=1)
+        self.pages = pages
+        self.fail_once = set(fail_once)
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def send_request_with_retry(self, url, method='GET', headers=None, params=None, data=None,
+                                timeout=30, context=""):
+        page = page_of(data)
+        with self._lock:
+            self.requests.append(page)
+            if page in self.fail_once:
+                self.fail_once.discard(page)
+                raise RuntimeWarning(f"第{page}页请求异常")
+        return {"data": self.pages.get(page, [])}
+
+
+def make_page(page, count=PER_PAGE):
+    return [{"name": f"公司{page}-{i}", "boothCode": f"{page}-{i}"} for i in range(count)]
+
+
+class RecordingExporter:
+    """记录每次写入的数据，不生成文件"""
+
+    def __init__(self, result=True):
+        self.result = result
+        self.saved = []
+
+    def save_to(self, path, rows, headers):
+        self.saved.append(list(rows))
+        return self.result
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def make_crawler():
+    crawlers = []
+
+    def factory(pages, fail_once=(), max_workers=3):
+        http_client = StubHttpClient(pages, fail_once)
+        crawler = BaseCrawler(EXHIBITION_CODE, max_workers=max_workers, http_client=http_client)
+        crawler.exporter = RecordingExporter()
+        crawlers.append(crawler)
+        return crawler
+
+    yield factory
+    for crawler in crawlers:
+        crawler.close()
+
+
+def run_engine(crawler, engine):
+    processed = {}
+    lock = threading.Lock()
+
+    def callback(page, items):
+        with lock:
+            processed[page] = items
+
+    if engine == "streaming":
+        has_data = crawler.paginate_streaming(1, callback)
+    else:
+        has_data = crawler.paginate_sequential(1, callback, prefetch=1)
+    return has_data, processed
+
+
+@pytest.mark.parametrize("engine", ["streaming", "sequential"])
+def test_failed_page_is_retried_once(make_crawler, engine):
+    pages = {page: make_page(page) for page in range(1, 6)}
+    crawler = make_crawler(pages, fail_once={3})
+
+    has_data, processed = run_engine(crawler, engine)
+
+    assert has_data
+    assert {page for page, items in processed.items() if items} == set(pages)
+    assert processed[3] == [{"Company": row["name"], "BoothNumber": row["boothCode"]} for row in pages[3]]
+    assert crawler.http_client.requests.count(3) == 2
+
+
+@pytest.mark.parametrize("engine", ["streaming", "sequential"])
+def test_failed_pages_past_data_end_are_not_reported_as_lost(make_crawler, engine, caplog):
+    pages = {page: make_page(page) for page in range(1, 4)}
+    crawler = make_crawler(pages)
+    # 末页之后的页一直出错（如返回404/500）
+    original = crawler.http_client.send_request_with_retry
+
+    def send(url, method='GET', headers=None, params=None, data=None, timeout=30, context=""):
+        page = page_of(data)
+        if page > 3:
+            with crawler.http_client._lock:
+                crawler.http_client.requests.append(page)
+            raise RuntimeWarning("404")
+        return original(url, method, headers, params, data, timeout, context)
+
+    crawler.http_client.send_request_with_retry = send
+
+    has_data, processed = run_engine(crawler, engine)
+
+    assert has_data
+    assert {page for page, items in processed.items() if items} == {1, 2, 3}
+    # 每个出错页最多重试一次；末页之后仍然失败的页视为超出数据末尾，不报告数据不完整
+    requests = crawler.http_client.requests
+    assert all(requests.count(page) <= 2 for page in requests)
+    assert "可能不完整" not in caplog.text
+
+
+@pytest.mark.parametrize("engine", ["streaming", "sequential"])
+def test_near_duplicate_page_stops_pagination(make_crawler, engine):
+    pages = {page: make_page(page) for page in range(1, 4)}
+    # 超出末页后接口循环返回打乱顺序的最后一页
+    for page in range(4, 30):
+        pages[page] = list(reversed(pages[3]))
+    crawler = make_crawler(pages, max_workers=1)
+
+    has_data, processed = run_engine(crawler, engine)
+
+    assert has_data
+    assert set(processed) == {1, 2, 3}
+    assert max(crawler.http_client.requests) <= 5
+
+
+def test_filter_new_rows_skips_rows_from_earlier_pages_only(make_crawler):
+    crawler = make_crawler({})
+    first = [{"Company": "A"}, {"Company": "A"}, {"Company": "B"}]
+    second = [{"Company": "B"}, {"Company": "C"}]
+
+    # 同一页内内容相同的行照常保留
+    assert crawler._filter_new_rows(first) == first
+    assert crawler._filter_new_rows(second) == [{"Company": "C"}]
+    assert crawler._duplicate_rows == 1
+
+    # 传入自己的集合时与默认集合互不影响，重复数由调用方统计
+    seen = set()
+    assert crawler._filter_new_rows(second, seen) == second
+    assert crawler._filter_new_rows(second, seen) == []
+    assert crawler._duplicate_rows == 1
+
+
+def test_filter_new_rows_distinguishes_equal_hashing_values(make_crawler):
+    crawler = make_crawler({})
+    rows = [{"v": -1}, {"v": -2}, {"v": 1}, {"v": 1.0}, {"v": True}]
+
+    assert crawler._filter_new_rows(rows[:1]) == rows[:1]
+    assert crawler._filter_new_rows(rows[1:]) == rows[1:]
+
+
+def test_final_flush_writes_last_partial_batch(make_crawler):
+    crawler = make_crawler({})
+    headers = ["Company"]
+    pages = [[{"Company": f"{page}-{i}"} for i in range(3)] for page in range(crawler.PENDING_FLUSH_PAGES + 2)]
+
+    for rows in pages:
+        assert crawler._buffer_rows(rows, headers)
+    assert crawler._final_flush(headers)
+
+    saved = crawler.exporter.saved
+    assert len(saved) == 2
+    assert len(saved[0]) == crawler.PENDING_FLUSH_PAGES * 3
+    assert saved[1] == pages[-2] + pages[-1]
+
+
+def test_final_flush_reports_failed_write(make_crawler):
+    crawler = make_crawler({})
+    crawler.exporter.result = False
+
+    assert crawler._buffer_rows([{"Company": "A"}], ["Company"])
+    assert not crawler._final_flush(["Company"])
+    assert not crawler._buffer_rows([{"Company": "B"}], ["Company"])
@@ -7,12 +7,19 @@
 3. 错误日志文件：记录系统错误 (app_error.log)
 """
 
+import atexit
 import logging
 import json
 import os
+import queue
 import threading
 from typing import Optional, Dict, Any, Callable
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时回退到标准库 json
+    orjson = None
 
 
 class UILogHandler(logging.Handler):
@@ -92,8 +99,27 @@ class UnifiedLogger:
     def __init__(self, ui_log_callback: Optional[Callable[[str], None]] = None):
         self._loggers = {}
         self._ui_log_callback = ui_log_callback
+        # 文件日志的后台写入线程（工作线程只负责入队，不直接写磁盘）
+        self._listeners = []
         self._setup_loggers()
     
+    def _attach_queued(self, logger: logging.Logger, handler: logging.Handler) -> None:
+        """通过队列把文件处理器挂到logger上：写文件由单独的后台线程完成，避免多个爬取线程争抢文件锁"""
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(log_queue))
+        listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        self._listeners.append(listener)
+    
+    def flush(self) -> None:
+        """停止后台写入线程，并把队列中剩余的日志全部写入文件（程序退出时自动调用）"""
+        listeners, self._listeners = self._listeners, []
+        for listener in listeners:
+            try:
+                listener.stop()
+            except Exception:
+                pass
+    
     def _setup_loggers(self):
         """设置日志记录器"""
         # 确保日志目录存在
@@ -135,7 +161,7 @@ class UnifiedLogger:
                 '%(asctime)s - %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S'
             ))
-            request_logger.addHandler(request_handler)
+            self._attach_queued(request_logger, request_handler)
             request_logger.setLevel(logging.DEBUG)
             request_logger.propagate = False
         self._loggers['request'] = request_logger
@@ -154,7 +180,7 @@ class UnifiedLogger:
                 '%(asctime)s - %(levelname)s - %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S'
             ))
-            error_logger.addHandler(error_handler)
+            self._attach_queued(error_logger, error_handler)
             error_logger.setLevel(logging.ERROR)
             error_logger.propagate = False
         self._loggers['error'] = error_logger
@@ -187,6 +213,10 @@ class UnifiedLogger:
                    data: Any = None, 
                    response: Any = None) -> None:
         """记录请求参数和响应体到请求日志文件（追加模式，记录全部历史）"""
+        # 请求日志未启用时直接返回，避免序列化参数和响应体
+        if not self._loggers['request'].isEnabledFor(logging.DEBUG):
+            return
+        
         # 获取当前时间
         from datetime import datetime
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -249,7 +279,16 @@ class UnifiedLogger:
     def _safe_json(self, obj: Any, max_length: int = 2000) -> str:
         """安全的JSON序列化"""
         try:
-            json_str = json.dumps(obj, ensure_ascii=False, indent=2)
+            json_str = None
+            # 每个请求的响应体都会记录到请求日志，优先用 orjson 序列化（C 实现，大响应体快很多）
+            if orjson is not None:
+                try:
+                    json_str = orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+                except TypeError:
+                    # 非字符串键、超出64位的整数等 orjson 不支持的值，交给标准库处理
+                    pass
+            if json_str is None:
+                json_str = json.dumps(obj, ensure_ascii=False, indent=2)
             if len(json_str) > max_length:
                 return json_str[:max_length] + "\n...[截断]"
             return json_str
@@ -275,6 +314,7 @@ def get_logger(ui_log_callback: Optional[Callable[[str], None]] = None) -> Unifi
     global _logger
     if _logger is None:
         _logger = UnifiedLogger(ui_log_callback)
+        atexit.register(_logger.flush)
     else:
         # 如果已经存在logger，但提供了UI回调，则在运行时注册回调（避免重复添加）
         if ui_log_callback is not None:
@@ -292,6 +332,18 @@ def console(message: str) -> None:
     get_logger().console(message)
 
 
+def is_enabled_for(level: int, channel: str = 'console') -> bool:
+    """判断指定日志通道是否会输出该级别的日志
+
+    用于在高频路径上跳过日志参数的构建（如 f-string 格式化、JSON 序列化）。
+
+    Args:
+        level: 日志级别（如 logging.INFO）
+        channel: 日志通道名称：'console'、'request' 或 'error'（默认 'console'）
+    """
+    return logging.getLogger(channel).isEnabledFor(level)
+
+
 def _emit_console_skip_ui(message: str) -> None:
     """内部：直接把消息发送给 `console` logger 的非-UI handlers（跳过 UILogHandler）。
 
@@ -477,6 +529,8 @@ def log_page_progress(page: int, count: int, ui: bool = True) -> None:
         count: 本页获取到的数据条数
         ui: 是否也发送到UI（默认 True）
     """
+    if not is_enabled_for(logging.INFO):
+        return
     message = f"📄 第{page}页完成，获取到{count}条数据"
     if ui:
         console(message)
@@ -491,6 +545,8 @@ def log_list_progress(page: int, company_count: int, ui: bool = True) -> None:
         company_count: 本页公司数量
         ui: 是否也发送到UI（默认 True）
     """
+    if not is_enabled_for(logging.INFO):
+        return
     message = f"📄 第{page}页 - 获取公司列表：{company_count}个"
     if ui:
         console(message)
@@ -506,6 +562,8 @@ def log_contacts_saved(page: int, contact_count: int, ui: bool = True) -> None:
         contact_count: 已保存联系人数量
         ui: 是否也发送到UI（默认 True）
     """
+    if not is_enabled_for(logging.INFO):
+        return
     message = f"💾 第{page}页 - 已保存{contact_count}条联系人"
     if ui:
         console(message)